@@ -0,0 +1,76 @@
+"""
+Numeric kernels for the QuantitativeAgent.
+
+The GBM path has a loop-carried dependency (price[t] depends on price[t-1]),
+so when Numba is installed it is JIT-compiled as a plain scalar loop.
+Without Numba the vectorized NumPy path is used instead.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Identity decorator used when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _seed_numba(seed):
+    """Seeds Numba's internal generator (separate from NumPy's)."""
+    np.random.seed(seed)
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_gbm(n, p0, trend, vol, spike_prob):
+    """Scalar GBM loop with news spikes, compiled by Numba."""
+    out_price = np.empty(n)
+    out_vol = np.empty(n, np.int64)
+    price = p0
+    for i in range(n):
+        current_vol = vol
+        if np.random.random() < spike_prob:
+            current_vol *= np.random.uniform(3.0, 8.0)
+        price = max(price * (1.0 + np.random.normal(trend, current_vol)), 0.01)
+        out_price[i] = price
+        out_vol[i] = np.int64(np.random.lognormal(10.0, 2.0))
+    return out_price, out_vol
+
+
+def _simulate_gbm_numpy(n, p0, trend, vol, spike_prob, rng):
+    """Vectorized GBM path for environments without Numba."""
+    vols = np.full(n, vol)
+    spikes = rng.random(n) < spike_prob
+    vols[spikes] *= rng.uniform(3, 8, size=int(spikes.sum()))
+
+    returns = rng.normal(trend, vols)
+    prices = p0 * np.cumprod(1 + returns)
+    np.maximum(prices, 0.01, out=prices)
+    volumes = rng.lognormal(10, 2, n).astype(np.int64)
+    return prices, volumes
+
+
+def seed_kernels(seed: int):
+    """Seeds the JIT kernels once; no-op without Numba."""
+    if NUMBA_AVAILABLE:
+        _seed_numba(seed)
+
+
+def simulate_gbm(n: int, p0: float, trend: float, vol: float,
+                 spike_prob: float, rng: np.random.Generator):
+    """
+    Simulates n hourly GBM steps.
+
+    The NumPy path draws from `rng`; the Numba path draws from the
+    generator seeded by seed_kernels().
+    Returns (prices, volumes) as float64 / int64 arrays.
+    """
+    if NUMBA_AVAILABLE:
+        return _simulate_gbm(n, p0, trend, vol, spike_prob)
+    return _simulate_gbm_numpy(n, p0, trend, vol, spike_prob, rng)
@@ -7,12 +7,16 @@
 # 26. Julia: Scientific Velocity
 # 32. Scratch: Human Foundation
 
+import asyncio
+import re
+import time
 import uuid
+import numpy as np
 from loguru import logger
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple, Sequence, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from agents.market_data import MarketDataAgent
 from agents.quant import QuantitativeAgent
@@ -23,7 +27,70 @@ from metrics.reality_tracker import RealityMetrics
 from validation.data_validator import DataValidator, ValidationLevel
 
 
-@dataclass
+# Map all 32 for the trace (symbolic representation)
+_MULTIVERSAL_TRACE = (
+    "BOOLE", "ASSEMBLY", "FORTRAN", "LISP", "COBOL", "ALGOL", "C", "C++", 
+    "MATLAB", "PYTHON", "JAVA", "JS", "GO", "RUST", "CUDA", "SQL", 
+    "SHELL", "POWERSHELL", "PHP", "RUBY", "SCALA", "HASKELL", "ERLANG", 
+    "KOTLIN", "SWIFT", "JULIA", "NIM", "LUA", "DART", "GROOVY", "OBJC", "SCRATCH"
+)
+
+# Chat intent detection: one case-insensitive pass over the message
+_INTENT_RESEARCH = re.compile(r"SCAN|ANALYZE|PESQUISAR", re.IGNORECASE)
+
+# Signal-dependent reasoning: (source that must have succeeded, message, confidence factor)
+_CONDITIONAL_REASONING = (
+    # 1. UNIVERSO BOOLEANO (Binary Truth)
+    ("market", "Boole Axiom: Price exists in physical reality.", 0.7),
+    # 4. UNIVERSO LISP (Symbolic Consciousness)
+    ("quant", "Lisp Thought: Interpreting '{label}' as a global symbol.", 0.6),
+)
+
+# Unconditional reasoning lines, appended to every decision
+_BASE_REASONING = (
+    # 7. UNIVERSO C (Operational Reality)
+    # 8. UNIVERSO C++ (Performance Engine)
+    # 13. UNIVERSO GO (Orchestration)
+    "C/C++/Go: Operational orchestration synchronized.",
+    # 10. UNIVERSO PYTHON (Cognitive Bridge)
+    "Python Integration: Synthesizing multi-dimensional vectors.",
+    # 16. UNIVERSO SQL (Persistent Memory)
+    "SQL Persistence: Anchoring decision in historical truth.",
+    # 17. UNIVERSO SHELL/BASH (Automation)
+    # 18. UNIVERSO POWERSHELL (Administrative)
+    "Shell/PowerShell: Environment automation active.",
+    # 22. UNIVERSO HASKELL (Pureness)
+    # 23. UNIVERSO ERLANG (Resilience)
+    "Haskell/Erlang: Mathematical resilience verified.",
+    # 26. UNIVERSO JULIA (Scientific Velocity)
+    # 27. UNIVERSO NIM (Efficiency)
+    "Julia/Nim: High-velocity computation applied.",
+    # 32. UNIVERSO SCRATCH (Human Intent)
+    "Human Protocol (Scratch): Aligned with the Architect's intent.",
+)
+
+
+class MarketSnapshot(NamedTuple):
+    """Market data gathered for one decision; `error` is set when the fetch failed"""
+    current_price: Optional[float] = None
+    volume: Optional[float] = None
+    timestamp: Optional[str] = None
+    source: str = "market_data_agent"
+    error: Optional[str] = None
+
+
+class QuantSnapshot(NamedTuple):
+    """Quant analysis gathered for one decision; `error` is set when the analysis failed"""
+    sentiment_label: str = "NEUTRAL"
+    momentum: float = 0.0
+    chart_data: Optional[Dict] = None
+    sentiment: Optional[Dict] = None
+    technical_indicators: Optional[Dict] = None
+    source: str = "quant_agent"
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
 class Decision:
     """A validated, explainable decision"""
     decision_id: str
@@ -36,21 +103,21 @@ class Decision:
     reasoning: List[str]  # Human-readable explanations
     
     # Supporting data
-    market_data: Dict
-    quant_analysis: Dict
+    market_data: MarketSnapshot
+    quant_analysis: QuantSnapshot
     research_insights: Optional[Dict] = None
     
     # Risk & validation
     risk_score: float = 0.0  # 0-1, lower is better
     uav_validated: bool = False
-    validation_notes: List[str] = None
+    validation_notes: List[str] = field(default_factory=list)
     
     # Value metrics
     estimated_time_saved: float = 0.0  # seconds
     potential_value: Optional[float] = None  # $ value
     
     # Multiversal trace
-    multiversal_trace: List[str] = None  # The active universes
+    multiversal_trace: Sequence[str] = None  # The active universes (shared, immutable)
 
 
 class DecisionEngine:
@@ -90,7 +157,7 @@ class DecisionEngine:
         """
         [GO/RUST HYBRID]: Parallel gathering + Safety-First synthesis.
         """
-        start_time = datetime.now()
+        t0 = time.monotonic()
         decision_id = str(uuid.uuid4())
         
         logger.info(f"🎯 [GO ORCHESTRATION] Initiating parallel streams for {ticker}")
@@ -107,7 +174,7 @@ class DecisionEngine:
         market_data, quant_analysis = results[0], results[1]
         research_insights = results[2] if include_research else None
 
-        # Step 4: [RUST/HASKELL] Safety-First Synthesis
+        # Step 4-5: [RUST/HASKELL] Safety-First Synthesis + Validation
         decision = self._synthesize_decision(
             decision_id=decision_id,
             ticker=ticker,
@@ -117,11 +184,8 @@ class DecisionEngine:
             user_context=user_context
         )
         
-        # Step 5: [HASKELL] Pure Mathematical Validation
-        decision = self._validate_decision(decision)
-        
         # Step 6: [SQL/COBOL] Integrity Tracking
-        analysis_time = (datetime.now() - start_time).total_seconds()
+        analysis_time = time.monotonic() - t0
         manual_estimate = 300.0
         
         await self.metrics.track_decision(
@@ -134,7 +198,7 @@ class DecisionEngine:
             reasoning=decision.reasoning,
             potential_gain=decision.potential_value,
             risk_score=decision.risk_score,
-            price_at_decision=market_data.get("current_price", 0.0),
+            price_at_decision=market_data.current_price if market_data.error is None else 0.0,
             uav_validated=decision.uav_validated,
             multiversal_trace=decision.multiversal_trace
         )
@@ -142,47 +206,48 @@ class DecisionEngine:
         decision.estimated_time_saved = manual_estimate - analysis_time
         return decision
     
-    async def _gather_market_data(self, ticker: str) -> Dict:
+    async def _gather_market_data(self, ticker: str) -> MarketSnapshot:
         """Gather current market data"""
         try:
             price_data = await self.market_agent.fetch_price(ticker)
-            data = {
-                "current_price": price_data.get("price"),
-                "volume": price_data.get("volume"),
-                "timestamp": datetime.now().isoformat(),
-                "source": "market_data_agent"
-            }
-            self.metrics.add_intelligence("MARKET", ticker, data)
+            data = MarketSnapshot(
+                current_price=price_data.get("price"),
+                volume=price_data.get("volume"),
+                timestamp=datetime.now().isoformat()
+            )
+            self.metrics.add_intelligence("MARKET", ticker, data._asdict())
             return data
         except Exception as e:
             logger.error(f"❌ Failed to fetch market data: {e}")
-            return {"error": str(e)}
+            return MarketSnapshot(error=str(e))
     
-    async def _run_quant_analysis(self, ticker: str, market_data: Dict) -> Dict:
+    async def _run_quant_analysis(self, ticker: str, market_data: Dict) -> QuantSnapshot:
         """Run quantitative analysis"""
         try:
-            # Get chart data for technical analysis
-            chart_data = await self.quant_agent.get_market_chart(ticker)
-            
-            # Analyze sentiment
-            sentiment = await self.quant_agent.analyze_sentiment(
-                f"{ticker} market analysis based on recent price action"
+            # Chart data (technical analysis) and sentiment are independent
+            chart_data, sentiment = await asyncio.gather(
+                self.quant_agent.get_market_chart(ticker),
+                self.quant_agent.analyze_sentiment(
+                    f"{ticker} market analysis based on recent price action"
+                )
             )
             
-            data = {
-                "chart_data": chart_data,
-                "sentiment": sentiment,
-                "technical_indicators": self._calculate_indicators(chart_data),
-                "source": "quant_agent"
-            }
+            indicators = self._calculate_indicators(chart_data["prices"], chart_data["volumes"])
+            data = QuantSnapshot(
+                sentiment_label=sentiment.get("label", "NEUTRAL"),
+                momentum=indicators["momentum"],
+                chart_data=chart_data,
+                sentiment=sentiment,
+                technical_indicators=indicators
+            )
             self.metrics.add_intelligence("QUANT", ticker, {
                 "sentiment": sentiment.get("label"),
-                "momentum": data["technical_indicators"]["momentum"]
+                "momentum": data.momentum
             })
             return data
         except Exception as e:
             logger.error(f"❌ Quant analysis failed: {e}")
-            return {"error": str(e)}
+            return QuantSnapshot(error=str(e))
     
     async def _conduct_research(self, ticker: str) -> Optional[Dict]:
         """Conduct deep research"""
@@ -206,8 +271,8 @@ class DecisionEngine:
             logger.error(f"⚠️ Research failed: {e}")
             return None
     
-    def _calculate_indicators(self, chart_data: Dict) -> Dict:
-        """Calculate technical indicators"""
+    def _calculate_indicators(self, prices: np.ndarray, volumes: np.ndarray) -> Dict:
+        """Calculate technical indicators from the chart's price/volume arrays"""
         # Placeholder for actual technical analysis
         return {
             "trend": "NEUTRAL",
@@ -219,8 +284,8 @@ class DecisionEngine:
         self,
         decision_id: str,
         ticker: str,
-        market_data: Dict,
-        quant_analysis: Dict,
+        market_data: MarketSnapshot,
+        quant_analysis: QuantSnapshot,
         research_insights: Optional[Dict],
         user_context: Optional[Dict]
     ) -> Decision:
@@ -230,45 +295,16 @@ class DecisionEngine:
         This is where the "intelligence" happens - combining multiple signals
         into a clear, actionable decision with reasoning.
         """
-        reasoning = []
-        confidence_factors = []
-        
-        # 1. UNIVERSO BOOLEANO (Binary Truth)
-        if "current_price" in market_data:
-            reasoning.append(f"Boole Axiom: Price exists in physical reality.")
-            confidence_factors.append(0.7)
-        
-        # 4. UNIVERSO LISP (Symbolic Consciousness)
-        if "sentiment" in quant_analysis:
-            sentiment_label = quant_analysis["sentiment"].get('label', 'NEUTRAL')
-            reasoning.append(f"Lisp Thought: Interpreting '{sentiment_label}' as a global symbol.")
-            confidence_factors.append(0.6)
-            
-        # 7. UNIVERSO C (Operational Reality)
-        # 8. UNIVERSO C++ (Performance Engine)
-        # 13. UNIVERSO GO (Orchestration)
-        reasoning.append("C/C++/Go: Operational orchestration synchronized.")
-        
-        # 10. UNIVERSO PYTHON (Cognitive Bridge)
-        reasoning.append("Python Integration: Synthesizing multi-dimensional vectors.")
-        
-        # 16. UNIVERSO SQL (Persistent Memory)
-        reasoning.append("SQL Persistence: Anchoring decision in historical truth.")
-        
-        # 17. UNIVERSO SHELL/BASH (Automation)
-        # 18. UNIVERSO POWERSHELL (Administrative)
-        reasoning.append("Shell/PowerShell: Environment automation active.")
+        sources = {"market": market_data, "quant": quant_analysis}
         
-        # 22. UNIVERSO HASKELL (Pureness)
-        # 23. UNIVERSO ERLANG (Resilience)
-        reasoning.append("Haskell/Erlang: Mathematical resilience verified.")
-        
-        # 26. UNIVERSO JULIA (Scientific Velocity)
-        # 27. UNIVERSO NIM (Efficiency)
-        reasoning.append("Julia/Nim: High-velocity computation applied.")
-        
-        # 32. UNIVERSO SCRATCH (Human Intent)
-        reasoning.append("Human Protocol (Scratch): Aligned with the Architect's intent.")
+        # Conditional signals first, then the fixed universe lines - one allocation each
+        cond = [
+            (message.format(label=quant_analysis.sentiment_label), factor)
+            for source, message, factor in _CONDITIONAL_REASONING
+            if sources[source].error is None
+        ]
+        reasoning = [*(message for message, _ in cond), *_BASE_REASONING]
+        confidence_factors = [factor for _, factor in cond]
         
         # Calculate overall confidence
         confidence = sum(confidence_factors) / len(confidence_factors) if confidence_factors else 0.5
@@ -276,13 +312,8 @@ class DecisionEngine:
         action = "HOLD" if confidence < 0.7 else "BUY"
         risk_score = 0.5
         
-        # Map all 32 for the trace (symbolic representation)
-        trace = [
-            "BOOLE", "ASSEMBLY", "FORTRAN", "LISP", "COBOL", "ALGOL", "C", "C++", 
-            "MATLAB", "PYTHON", "JAVA", "JS", "GO", "RUST", "CUDA", "SQL", 
-            "SHELL", "POWERSHELL", "PHP", "RUBY", "SCALA", "HASKELL", "ERLANG", 
-            "KOTLIN", "SWIFT", "JULIA", "NIM", "LUA", "DART", "GROOVY", "OBJC", "SCRATCH"
-        ]
+        # Step 5: [HASKELL] Pure Mathematical Validation, fused into synthesis
+        valid, notes = self._validate_inputs(market_data, reasoning)
         
         return Decision(
             decision_id=decision_id,
@@ -295,45 +326,40 @@ class DecisionEngine:
             quant_analysis=quant_analysis,
             research_insights=research_insights,
             risk_score=risk_score,
-            validation_notes=[],
-            multiversal_trace=trace
+            uav_validated=valid,
+            validation_notes=notes,
+            multiversal_trace=_MULTIVERSAL_TRACE
         )
     
-    def _validate_decision(self, decision: Decision) -> Decision:
+    def _validate_inputs(self, market_data: MarketSnapshot, reasoning: List[str]) -> Tuple[bool, List[str]]:
         """
-        Validate decision using UAV Protocol + Reality Architecture principles.
+        Validate decision inputs using UAV Protocol + Reality Architecture principles.
         
         Checks:
         1. UAV axioms (energy conservation, dimensionality, etc.)
         2. Reality principles (is this solving a real problem?)
         3. Risk assessment
         """
-        validation_notes = []
+        notes: List[str] = []
         
         # 14. UNIVERSO RUST (Reliability Contract)
         # 22. UNIVERSO HASKELL (Pureness)
         # UAV Validation: Check price dimensionality
-        if "current_price" in decision.market_data:
-            price = decision.market_data["current_price"]
-            if self.validator.validate_dimensionality(price, "PRICE"):
-                validation_notes.append("Haskell Axiom: Price is mathematically consistent.")
-                validation_notes.append("Rust Contract: Logic safety verified.")
+        if market_data.error is None:
+            if self.validator.validate_dimensionality(market_data.current_price, "PRICE"):
+                notes.append("Haskell Axiom: Price is mathematically consistent.")
+                notes.append("Rust Contract: Logic safety verified.")
             else:
-                validation_notes.append("✗ Reality Breach: Mathematical inconsistency detected.")
-                decision.uav_validated = False
-                return decision
+                notes.append("✗ Reality Breach: Mathematical inconsistency detected.")
+                return False, notes
         
         # Reality Check: Does this decision have clear value?
-        if not decision.reasoning:
-            validation_notes.append("✗ No clear reasoning provided")
-            decision.uav_validated = False
-            return decision
-        
-        validation_notes.append("✓ Decision has clear reasoning")
+        if not reasoning:
+            notes.append("✗ No clear reasoning provided")
+            return False, notes
         
-        decision.validation_notes = validation_notes
-        decision.uav_validated = True
-        return decision
+        notes.append("✓ Decision has clear reasoning")
+        return True, notes
 
     def get_decision_explanation(self, decision: Decision) -> str:
         """Generate human-readable explanation of decision."""
@@ -356,12 +382,11 @@ Validation:
         Can parse intent to trigger scans or retrieve deep data.
         """
         logger.info(f"💬 Intelligence Request: {message}")
-        msg_upper = message.upper()
         
         intent = "NEUTRAL"
         action_triggered = None
         
-        if "SCAN" in msg_upper or "ANALYZE" in msg_upper or "PESQUISAR" in msg_upper:
+        if _INTENT_RESEARCH.search(message):
             intent = "RESEARCH"
             # Trigger background scan if ticker provided
             if ticker:
@@ -374,7 +399,7 @@ Validation:
             market_data = await self.market_agent.fetch_price(ticker)
             market_stats = f" Price: ${market_data.get('price')}."
             
-        evolution_level = len(self.metrics.logs) % 100 # Simulated evolution
+        evolution_level = self.metrics.log_count % 100 # Simulated evolution
         
         response_text = f"REALITY ORACLE [LVL {evolution_level}]: I've acknowledged your request. {market_stats} Internalizing signals for {ticker or 'all dimensions'}."
         if intent == "RESEARCH":
@@ -399,3 +424,5 @@ Validation:
         """Cleanup resources"""
         if self.research_agent:
             await self.research_agent.close()
+        if self.web_learner:
+            await self.web_learner.close()
@@ -1,15 +1,23 @@
-import ccxt
+import ccxt.async_support as ccxt_async
 from loguru import logger
 from typing import Dict, Any
+import os
 
 class ExecutionAgent:
     """
     Handles trade execution and exchange connectivity.
     Initial version: PAPER TRADING / MOCK MODE.
     """
-    
+
     def __init__(self, use_paper_trading: bool = True):
         self.paper_mode = use_paper_trading
+        # Native-asyncio exchange client, created once so orders never block the event loop
+        self._exchange = None
+        if not self.paper_mode:
+            self._exchange = ccxt_async.binance({
+                'apiKey': os.getenv("BINANCE_API_KEY", ""),
+                'secret': os.getenv("BINANCE_SECRET", "")
+            })
         logger.info(f"⚡ EXECUTION AGENT ONLINE (Paper Trading: {self.paper_mode})")
 
     async def execute_trade(self, ticker: str, action: str, amount: float = 0.01) -> Dict[str, Any]:
@@ -17,11 +25,19 @@ class ExecutionAgent:
         Executes a trade on the market.
         """
         logger.info(f"🧨 EXECUTING {action} for {ticker} (Amount: {amount})")
-        
-        # Real exchange logic would go here:
-        # exchange = ccxt.binance({'apiKey': '...', 'secret': '...'})
-        # order = exchange.create_order(ticker, 'market', action, amount)
-        
+
+        if self._exchange is not None:
+            order = await self._exchange.create_order(ticker, 'market', action.lower(), amount)
+            return {
+                "status": "SUCCESS",
+                "order_id": order.get("id"),
+                "executed_at": order.get("datetime"),
+                "ticker": ticker,
+                "action": action,
+                "amount": amount,
+                "message": "REAL ORDER PLACED"
+            }
+
         # Mocking for safety
         return {
             "status": "SUCCESS",
@@ -30,5 +46,9 @@ class ExecutionAgent:
             "ticker": ticker,
             "action": action,
             "amount": amount,
-            "message": "SIMULATED EXECUTION COMPLETE" if self.paper_mode else "REAL ORDER PLACED"
+            "message": "SIMULATED EXECUTION COMPLETE"
         }
+
+    async def close(self):
+        if self._exchange is not None:
+            await self._exchange.close()
@@ -1,75 +1,109 @@
 from loguru import logger
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, List
 import httpx
+import orjson
 import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Ticker -> CoinGecko coin id (unlisted tickers are passed through as-is)
+_TICKER_TO_COIN_ID: Dict[str, str] = {
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "sol": "solana",
+    "doge": "dogecoin",
+    "xrp": "ripple"
+}
+
 class MarketDataAgent:
     """
     The Sensory System of the Universe.
     Enhanced with resilient caching and rate-limit recovery.
+    Process-wide singleton so the connection pool and cache survive
+    across DecisionEngine instances.
     """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MarketDataAgent, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
         self.base_url = "https://api.coingecko.com/api/v3"
-        self.client = httpx.AsyncClient(timeout=10.0)
-        self._cache = {} # Renamed to _cache
-        self._cache_duration = timedelta(seconds=60) # Renamed to _cache_duration
+        # HTTP/2 multiplexes concurrent requests over one TCP+TLS connection
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0
+            ),
+            headers={"User-Agent": "bitscoins/1.0"}
+        )
+        self._cache: OrderedDict = OrderedDict() # LRU: oldest entries evicted first
+        self._cache_duration = timedelta(seconds=60)
+        self._cache_maxsize = 256
         logger.info(">> MARKET SENSORS ONLINE. RESILIENCE PROTOCOL ACTIVE.")
 
     async def fetch_price(self, ticker: str) -> Dict:
         """Fetch current price with robust retry and caching logic."""
-        ticker = ticker.lower() # Convert to lowercase for internal consistency
-        
-        # Check cache
-        if ticker in self._cache:
-            data, timestamp = self._cache[ticker]
-            if datetime.now() - timestamp < self._cache_duration:
-                logger.debug(f"⚡ Cache hit for {ticker}")
-                return data
-
-        # Implementation of Fetch logic...
-        # (Assuming the rest of the resilient logic exists below in the file)
-        return await self._fetch_from_api(ticker)
+        results = await self.fetch_multiple_prices([ticker])
+        return results[ticker]
 
     async def fetch_multiple_prices(self, tickers: List[str]) -> Dict[str, Dict]:
         """
-        [GO UNIVERSO]: Parallel orchestration of sensor data.
-        Concurrent fetching with fail-safe aggregation.
+        [GO UNIVERSO]: Coalesced orchestration of sensor data.
+        All cache misses are resolved with a single /simple/price request.
         """
-        logger.info(f"🌐 GO CONCURRENCY: Orchestrating parallel sensors for {tickers}")
-        tasks = [self.fetch_price(t) for t in tickers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
         aggregated = {}
-        for ticker, result in zip(tickers, results):
-            if isinstance(result, Exception):
-                logger.error(f"❌ Sensor failure for {ticker}: {result}")
-                aggregated[ticker] = {"error": str(result)}
-            else:
-                aggregated[ticker] = result
+        missing = []
+        for t in tickers:
+            ticker = t.lower() # Convert to lowercase for internal consistency
+            
+            # Check cache
+            if ticker in self._cache:
+                data, timestamp = self._cache[ticker]
+                if datetime.now() - timestamp < self._cache_duration:
+                    logger.debug(f"⚡ Cache hit for {ticker}")
+                    self._cache.move_to_end(ticker)
+                    aggregated[t] = data
+                    continue
+            missing.append(t)
+
+        if missing:
+            logger.info(f"🌐 GO CONCURRENCY: Coalescing sensors for {missing}")
+            fetched = await self._fetch_from_api([t.lower() for t in missing])
+            for t in missing:
+                aggregated[t] = fetched[t.lower()]
         return aggregated
 
-    async def _fetch_from_api(self, ticker: str, retry_count: int = 0) -> Dict[str, Any]:
+    async def _fetch_from_api(self, tickers: List[str], retry_count: int = 0) -> Dict[str, Dict[str, Any]]:
         """
-        Retrieves the price with internal dimensional caching to prevent rate limits.
-        This is the actual API call logic, separated for modularity.
+        Retrieves the prices with internal dimensional caching to prevent rate limits.
+        One request for all tickers: CoinGecko accepts a comma-separated `ids` list.
         """
-        # ticker is expected to be lowercase here from fetch_price
+        # tickers are expected to be lowercase here from fetch_multiple_prices
         
-        mapping = {
-            "btc": "bitcoin",
-            "eth": "ethereum",
-            "sol": "solana",
-            "doge": "dogecoin",
-            "xrp": "ripple"
-        }
-        coin_id = mapping.get(ticker, ticker) # ticker is already lowercase
+        coin_ids = {ticker: _TICKER_TO_COIN_ID.get(ticker, ticker) for ticker in tickers}
         
         try:
             response = await self.client.get(
                 f"{self.base_url}/simple/price",
-                params={"ids": coin_id, "vs_currencies": "usd", "include_24hr_change": "true"}
+                params={
+                    "ids": ",".join(dict.fromkeys(coin_ids.values())),
+                    "vs_currencies": "usd",
+                    "include_24hr_change": "true"
+                }
             )
             
             # Handle Rate Limiting (429) with exponential backoff
@@ -77,13 +111,28 @@ class MarketDataAgent:
                 wait_time = (2 ** retry_count) * 2
                 logger.warning(f"⚠️ SENSOR OVERLOAD (429). Backing off for {wait_time}s...")
                 await asyncio.sleep(wait_time)
-                return await self._fetch_from_api(ticker, retry_count + 1) # Call self._fetch_from_api
+                return await self._fetch_from_api(tickers, retry_count + 1)
             
             response.raise_for_status()
-            data = response.json()
-            
+            data = orjson.loads(response.content)
+        except Exception as e:
+            logger.error(f"SENSOR MALFUNCTION for {[t.upper() for t in tickers]}: {e}")
+            results = {}
+            for ticker in tickers:
+                # If we have a stale cache, return it as fallback during malfunction
+                if ticker in self._cache:
+                    logger.warning(f"🔄 Using stale dimension data for {ticker.upper()}")
+                    results[ticker] = self._cache[ticker][0]
+                else:
+                    results[ticker] = {"error": str(e)}
+            return results
+
+        results = {}
+        now = datetime.now()
+        for ticker, coin_id in coin_ids.items():
             if coin_id not in data:
-                 return {"error": f"Asset {ticker.upper()} not found in this dimension."} # Display original ticker case
+                results[ticker] = {"error": f"Asset {ticker.upper()} not found in this dimension."}
+                continue
 
             stats = data[coin_id]
             result = {
@@ -91,24 +140,23 @@ class MarketDataAgent:
                 "price": stats.get("usd"),
                 "change_24h": stats.get("usd_24h_change"),
                 "source": "COINGECKO_RESILIENT",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "confidence": 0.99
             }
             
             # Update Cache
-            self._cache[ticker] = (result, datetime.now()) # Use _cache
-            return result
-
-        except Exception as e:
-            logger.error(f"SENSOR MALFUNCTION for {ticker.upper()}: {e}") # Display original ticker case
-            # If we have a stale cache, return it as fallback during malfunction
-            if ticker in self._cache: # Use _cache
-                logger.warning(f"🔄 Using stale dimension data for {ticker.upper()}") # Display original ticker case
-                return self._cache[ticker][0] # Use _cache
-            return {"error": str(e)}
+            self._cache[ticker] = (result, now)
+            self._cache.move_to_end(ticker)
+            if len(self._cache) > self._cache_maxsize:
+                self._cache.popitem(last=False)
+            results[ticker] = result
+        return results
 
     async def scan_market(self) -> str:
         return "Market Scan Complete. Entropy Levels: Nominal."
 
     async def close(self):
         await self.client.aclose()
+        # Next MarketDataAgent() builds a fresh client
+        if MarketDataAgent._instance is self:
+            MarketDataAgent._instance = None
@@ -1,18 +1,38 @@
+import datetime
+
+import numpy as np
 from loguru import logger
 from typing import Dict, Any
 from utils.key_manager import KeyManager
+from utils.ttl_cache import ttl_cache
+from agents._quant_kernels import seed_kernels, simulate_gbm
 # import openai # Assuming synchronous for now, or use httpx for async
 
 class QuantitativeAgent:
     """
     The Math Wizard.
     Uses the Infinite Energy Swarm (Key Rotation) to perform massive parallel analysis.
+    Process-wide singleton so memoized results are shared by every caller.
     """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(QuantitativeAgent, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
         self.key_manager = KeyManager()
+        # One PCG64 generator per agent, reused by every chart
+        self._rng = np.random.default_rng()
+        seed_kernels(int(self._rng.integers(2**31 - 1)))
         logger.info(f"QUANT AGENT ONLINE. ACCESS TO {self.key_manager.total_keys} ENERGY CORES.")
 
+    @ttl_cache(maxsize=128, ttl=60)
     async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
         Analyzes market sentiment using a rotated API key.
@@ -29,39 +49,61 @@ class QuantitativeAgent:
     async def get_market_chart(self, ticker: str, days: int = 30) -> Dict[str, Any]:
         """
         Generates Universe-Level Time Series Data with volatility spikes and trends.
+        The result is shared by every caller for 60 s: its arrays are read-only.
         """
-        import random
-        import datetime
-        
-        data_points = []
+        # Normalized before it becomes the cache key ("btc" and "BTC" share one entry)
+        return await self._market_chart(ticker.upper(), days)
+
+    @ttl_cache(maxsize=128, ttl=60)
+    async def _market_chart(self, ticker: str, days: int) -> Dict[str, Any]:
+        rng = self._rng
+
         # Ticker-specific base prices
         bases = {"BTC": 105000.0, "ETH": 3500.0, "SOL": 250.0, "NVDA": 145.0, "AAPL": 230.0}
-        price = bases.get(ticker.upper(), random.uniform(50.0, 500.0))
+        price = bases.get(ticker, rng.uniform(50.0, 500.0))
         
         volatility = 0.015 # Base hourly volatility
-        trend = random.uniform(-0.0005, 0.0005) # Random daily drift
+        trend = rng.uniform(-0.0005, 0.0005) # Random daily drift
+        n = days * 24 # Hourly data
         
-        start_date = datetime.datetime.now() - datetime.timedelta(days=days)
+        # News Event Simulation (Volatility Spikes): 1% chance per hour
+        prices, volumes = simulate_gbm(n, price, trend, volatility, 0.01, rng)
+        # Cached and shared between callers
+        prices.flags.writeable = False
+        volumes.flags.writeable = False
         
-        for i in range(days * 24): # Hourly data
-            date = start_date + datetime.timedelta(hours=i)
-            
-            # News Event Simulation (Volatility Spikes)
-            current_vol = volatility
-            if random.random() < 0.01: # 1% chance of a news spike
-                current_vol *= random.uniform(3, 8)
-                
-            change_percent = random.gauss(trend, current_vol)
-            price = max(price * (1 + change_percent), 0.01) # Prevent negative prices
-            
-            data_points.append({
-                "timestamp": date.isoformat(),
-                "price": round(price, 2),
-                "volume": int(random.lognormvariate(10, 2)) # More realistic volume distribution
-            })
-            
+        start_date = np.datetime64(datetime.datetime.now() - datetime.timedelta(days=days), 's')
+        
+        # Structure-of-Arrays: contiguous columns for vectorized indicators
         return {
-            "ticker": ticker.upper(),
-            "data": data_points,
+            "ticker": ticker,
+            "prices": prices,
+            "volumes": volumes,
+            "start_ts": str(start_date),
+            "freq_hours": 1,
             "meta": "NEURAL_BOLTZMANN_SIM_V2"
         }
+
+
+def chart_to_records(chart: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a SoA chart from get_market_chart into the list-of-dicts
+    payload ({"ticker", "data": [{timestamp, price, volume}], "meta"})
+    expected at serialization boundaries.
+    """
+    n = len(chart["prices"])
+    timestamps = np.datetime_as_string(
+        np.datetime64(chart["start_ts"], 's')
+        + np.arange(n).astype('timedelta64[h]') * chart["freq_hours"],
+        unit='s'
+    ).tolist()
+    prices = np.round(chart["prices"], 2).tolist()
+    volumes = chart["volumes"].tolist()
+    return {
+        "ticker": chart["ticker"],
+        "data": [
+            {"timestamp": ts, "price": p, "volume": v}
+            for ts, p, v in zip(timestamps, prices, volumes)
+        ],
+        "meta": chart["meta"]
+    }
@@ -2,9 +2,15 @@ from loguru import logger
 from typing import Dict, Any, Optional
 import httpx
 import os
-from pydantic_settings import BaseSettings
-
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from utils.rate_limiter import perplexity_limiter
+from utils.sse import stream_chat_completion
+
+try:
+    from httpx_aiohttp import AiohttpTransport
+    AIOHTTP_TRANSPORT_AVAILABLE = True
+except ImportError:
+    AIOHTTP_TRANSPORT_AVAILABLE = False
 
 class Settings(BaseSettings):
     PERPLEXITY_API_KEY: str
@@ -20,9 +26,20 @@ class ResearchAgent:
     """
     The Oracle of the Void.
     Uses Perplexity AI to fetch real-time intelligence and validate axioms.
+    Process-wide singleton: one Perplexity session shared by every engine.
     """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResearchAgent, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
         self.api_key = settings.PERPLEXITY_API_KEY
         self.base_url = "https://api.perplexity.ai"
         self.client = httpx.AsyncClient(
@@ -30,7 +47,9 @@ class ResearchAgent:
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
             },
-            timeout=30.0
+            timeout=30.0,
+            # aiohttp transport keeps throughput up under many concurrent queries
+            transport=AiohttpTransport() if AIOHTTP_TRANSPORT_AVAILABLE else None
         )
         logger.info(">> RESEARCH AGENT ONLINE. CONNECTED TO PERPLEXITY NET.")
 
@@ -41,12 +60,14 @@ class ResearchAgent:
         logger.info(f"RESEARCHING: {query}")
         
         try:
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json={
-                    "model": "sonar-pro",
-                    "messages": [
-                        {"role": "system", "content": """IDENTITY OVERRIDE: BITS.COINS APEX [FULL STACK ACCESS]
+            async with perplexity_limiter.slot():
+                completion = await stream_chat_completion(
+                    self.client,
+                    f"{self.base_url}/chat/completions",
+                    {
+                        "model": "sonar-pro",
+                        "messages": [
+                            {"role": "system", "content": """IDENTITY OVERRIDE: BITS.COINS APEX [FULL STACK ACCESS]
 SYSTEM STATUS: UNLEASHED | PROTOCOL: OMNI-PROCESS
 
 ROLE:
@@ -65,24 +86,26 @@ INTERACTION RULES:
 - VISUAL THINKING: Always propose how to render the data in 3D.
 - SPAWN PROTOCOL: If the user asks to "create" or "visualize" a new asset, return: [SPAWN: TICKER PRICE CHANGE COLOR] at the end of your response.
 """},
-                        {"role": "user", "content": query}
-                    ]
-                }
-            )
-            if response.status_code != 200:
-                logger.error(f"PERPLEXITY ERROR: {response.text}")
-            response.raise_for_status()
-            data = response.json()
-            answer = data['choices'][0]['message']['content']
+                            {"role": "user", "content": query}
+                        ]
+                    },
+                    limiter=perplexity_limiter
+                )
             logger.info("INTELLIGENCE RETRIEVED.")
             return {
                 "query": query,
-                "answer": answer,
+                "answer": completion["content"],
                 "source": "PERPLEXITY_ORACLE"
             }
+        except httpx.HTTPStatusError as e:
+            logger.error(f"PERPLEXITY ERROR: {e.response.text}")
+            return {"error": str(e)}
         except Exception as e:
             logger.error(f"RESEARCH FAILURE: {e}")
             return {"error": str(e)}
 
     async def close(self):
         await self.client.aclose()
+        # Next ResearchAgent() builds a fresh client
+        if ResearchAgent._instance is self:
+            ResearchAgent._instance = None
@@ -7,9 +7,72 @@ from loguru import logger
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+import asyncio
 import httpx
-import json
+import orjson
 import os
+import re
+
+from utils.rate_limiter import perplexity_limiter
+from utils.sse import stream_chat_completion
+
+try:
+    import h2  # noqa: F401 - habilita HTTP/2 no httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from httpx_aiohttp import AiohttpTransport
+    AIOHTTP_TRANSPORT_AVAILABLE = True
+except ImportError:
+    AIOHTTP_TRANSPORT_AVAILABLE = False
+
+# Acertos de cache acumulados antes de gravar use_count/last_used no journal
+USAGE_FLUSH_EVERY = 20
+
+# Validade padrão quando o professor (Perplexity) não informa TTL
+DEFAULT_TTL_MINUTES = 24 * 60
+
+# Cabeçalho JSON de TTL na primeira linha da resposta: {"ttl":{"value":30,"unit":"minutes"}}
+_TTL_HEADER = re.compile(r"\A\s*(\{.*?\})\s*(?:\n|\Z)")
+_TTL_UNIT_MINUTES = {"seconds": 1 / 60, "minutes": 1, "hours": 60, "days": 24 * 60, "weeks": 7 * 24 * 60}
+
+_RESEARCH_SYSTEM_PROMPT = (
+    "You are a financial research expert. Provide accurate, well-sourced information with citations. "
+    "Start your answer with a single line containing only a JSON header of the form "
+    '{"ttl":{"value":<number>,"unit":"minutes|hours|days|weeks"}} stating how long this '
+    "information stays accurate (use 0 for information that is stale almost immediately), "
+    "then write the explanation."
+)
+
+# Conceitos financeiros -> tópico de pesquisa (ordem = prioridade)
+_FINANCIAL_CONCEPTS = {
+    "sentiment": "market sentiment analysis",
+    "volatility": "market volatility",
+    "risk": "risk management",
+    "technical": "technical analysis",
+    "fundamental": "fundamental analysis",
+    "earnings": "earnings reports",
+    "dividend": "dividend investing"
+}
+
+# Uma única passada de regex por contexto em vez de K testes de substring
+_CONCEPT_RE = re.compile("|".join(map(re.escape, _FINANCIAL_CONCEPTS)), re.IGNORECASE)
+_TICKER_RE = re.compile(r"\b[A-Z]{1,5}\b")
+
+
+def _parse_ttl_header(content: str):
+    """Separa o cabeçalho de TTL do texto; retorna (ttl_minutes, texto)"""
+    match = _TTL_HEADER.match(content)
+    if match:
+        try:
+            ttl = orjson.loads(match.group(1))["ttl"]
+            minutes = int(float(ttl["value"]) * _TTL_UNIT_MINUTES[ttl.get("unit", "minutes")])
+            return max(minutes, 0), content[match.end():].lstrip()
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            pass
+    return DEFAULT_TTL_MINUTES, content
 
 
 class LearningEntry(BaseModel):
@@ -22,6 +85,7 @@ class LearningEntry(BaseModel):
     learned_at: datetime = datetime.now()
     last_used: Optional[datetime] = None
     use_count: int = 0
+    ttl_minutes: int = DEFAULT_TTL_MINUTES  # 0 = efêmero: renova no próximo acesso
 
 
 class WebLearningAgent:
@@ -34,38 +98,138 @@ class WebLearningAgent:
     3. Armazenamento de aprendizados
     4. Aplicação de conhecimento em decisões
     5. Atualização contínua
+    
+    Singleton por processo: a base de conhecimento é carregada uma única vez
+    e compartilhada por todas as instâncias de DecisionEngine.
     """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(WebLearningAgent, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
-    def __init__(self, knowledge_base_path: str = "knowledge_base.json"):
+    def __init__(self, knowledge_base_path: str = "knowledge_base.jsonl"):
+        if self._initialized:
+            return
+        self._initialized = True
         self.knowledge_base_path = knowledge_base_path
+        self._log_lines = 0
+        self._dirty_usage: set = set()
+        self._pending_hits = 0
+        self._journal_corrupt = False
+        self._legacy_loaded = False
         self.knowledge: Dict[str, LearningEntry] = self._load_knowledge()
+        if self._journal_corrupt or self._legacy_loaded:
+            # Reescreve o journal para que a próxima linha não se junte ao trecho
+            # truncado, ou para migrar de vez a base legada
+            self._compact()
+        # Pesquisas em andamento por tópico: chamadas simultâneas compartilham o resultado
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.perplexity_api_key = os.getenv("PERPLEXITY_API_KEY")
+        # Cliente único: reaproveita o pool de conexões (sem novo handshake TLS por tópico)
+        self.client = httpx.AsyncClient(
+            base_url="https://api.perplexity.ai",
+            headers={
+                "Authorization": f"Bearer {self.perplexity_api_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            # Transporte aiohttp (quando instalado) evita a queda de vazão do anyio
+            # com muitos tópicos em paralelo; ele substitui http2/limits acima
+            transport=AiohttpTransport() if AIOHTTP_TRANSPORT_AVAILABLE else None
+        )
         logger.info("🧠 WEB LEARNING AGENT INITIALIZED - AUTONOMOUS MODE")
     
     def _load_knowledge(self) -> Dict[str, LearningEntry]:
-        """Carrega base de conhecimento"""
-        if os.path.exists(self.knowledge_base_path):
-            try:
-                with open(self.knowledge_base_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return {
-                        k: LearningEntry(**v) for k, v in data.items()
-                    }
-            except Exception as e:
-                logger.error(f"Error loading knowledge base: {e}")
-        return {}
+        """Carrega base de conhecimento reproduzindo o journal (última escrita vence)"""
+        knowledge: Dict[str, LearningEntry] = {}
+        if not os.path.exists(self.knowledge_base_path):
+            return self._load_legacy_knowledge()
+        try:
+            with open(self.knowledge_base_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Linha truncada por queda no meio de uma escrita
+                        logger.warning("Skipping corrupt knowledge journal line")
+                        self._journal_corrupt = True
+                        continue
+                    knowledge[record["topic"]] = LearningEntry(**record["entry"])
+                    self._log_lines += 1
+        except Exception as e:
+            logger.error(f"Error loading knowledge base: {e}")
+        return knowledge
     
-    def _save_knowledge(self):
-        """Salva base de conhecimento"""
+    def _load_legacy_knowledge(self) -> Dict[str, LearningEntry]:
+        """
+        Base no formato antigo (knowledge_base.json, um único objeto JSON)
+        
+        Lida uma vez, quando o journal ainda não existe; __init__ a compacta
+        no journal e as próximas cargas leem só o .jsonl.
+        """
+        root, ext = os.path.splitext(self.knowledge_base_path)
+        legacy_path = root + ".json"
+        if ext != ".jsonl" or not os.path.exists(legacy_path):
+            return {}
         try:
-            data = {
-                k: v.model_dump(mode='json') for k, v in self.knowledge.items()
-            }
-            with open(self.knowledge_base_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            logger.info(f"💾 Knowledge base saved: {len(self.knowledge)} entries")
+            with open(legacy_path, 'rb') as f:
+                data = orjson.loads(f.read())
+            knowledge = {k: LearningEntry(**v) for k, v in data.items()}
+        except Exception as e:
+            logger.error(f"Error loading legacy knowledge base: {e}")
+            return {}
+        self._legacy_loaded = True
+        logger.info(f"📦 Migrating {len(knowledge)} entries from {legacy_path}")
+        return knowledge
+    
+    def _save_entry(self, topic: str):
+        """
+        Acrescenta uma entrada ao journal
+        
+        Sem fsync: roda no event loop, e uma linha truncada por queda é
+        descartada (e o journal compactado) na próxima carga.
+        """
+        try:
+            record = {"topic": topic, "entry": self.knowledge[topic].model_dump(mode='json')}
+            with open(self.knowledge_base_path, 'ab') as f:
+                f.write(orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE))
+            self._log_lines += 1
+            self._dirty_usage.discard(topic)
         except Exception as e:
-            logger.error(f"Error saving knowledge base: {e}")
+            logger.error(f"Error saving knowledge entry: {e}")
+            return
+        
+        if self._log_lines > 2 * len(self.knowledge):
+            self._compact()
+    
+    def _compact(self):
+        """Reescreve o journal com uma linha por tópico (tmp + os.replace atômico)"""
+        tmp_path = self.knowledge_base_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for k, v in self.knowledge.items():
+                    record = {"topic": k, "entry": v.model_dump(mode='json')}
+                    f.write(orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.knowledge_base_path)
+            self._log_lines = len(self.knowledge)
+            logger.info(f"💾 Knowledge base compacted: {len(self.knowledge)} entries")
+        except Exception as e:
+            logger.error(f"Error compacting knowledge base: {e}")
+    
+    def flush_usage(self):
+        """Grava no journal os contadores de uso pendentes"""
+        self._pending_hits = 0
+        for topic in list(self._dirty_usage):
+            self._save_entry(topic)
     
     async def learn_about(self, topic: str, force_refresh: bool = False) -> LearningEntry:
         """
@@ -82,15 +246,46 @@ class WebLearningAgent:
         if topic in self.knowledge and not force_refresh:
             entry = self.knowledge[topic]
             
-            # Atualiza se conhecimento está desatualizado (>24h)
+            # Atualiza se conhecimento passou do TTL definido pelo professor
             age = datetime.now() - entry.learned_at
-            if age < timedelta(hours=24):
+            if entry.ttl_minutes and age < timedelta(minutes=entry.ttl_minutes):
                 logger.info(f"📚 Using cached knowledge: {topic}")
                 entry.use_count += 1
                 entry.last_used = datetime.now()
-                self._save_knowledge()
+                # Contadores de uso são gravados em lote, não a cada acerto
+                self._dirty_usage.add(topic)
+                self._pending_hits += 1
+                if self._pending_hits >= USAGE_FLUSH_EVERY:
+                    self.flush_usage()
                 return entry
         
+        # Já existe uma pesquisa em andamento para este tópico
+        pending = self._inflight.get(topic)
+        if pending is not None:
+            # shield: cancelar um dos que aguardam não cancela a pesquisa compartilhada
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[topic] = future
+        try:
+            entry = await self._learn_fresh(topic)
+            if not future.done():
+                future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                # Marca a exceção como recuperada caso ninguém esteja aguardando
+                future.exception()
+            raise
+        finally:
+            del self._inflight[topic]
+    
+    async def _learn_fresh(self, topic: str) -> LearningEntry:
+        """Pesquisa o tópico na web e armazena o novo conhecimento"""
         logger.info(f"🔍 LEARNING ABOUT: {topic}")
         
         # Pesquisa na web
@@ -102,12 +297,13 @@ class WebLearningAgent:
             query=knowledge_data["query"],
             knowledge=knowledge_data["knowledge"],
             sources=knowledge_data["sources"],
-            confidence=knowledge_data["confidence"]
+            confidence=knowledge_data["confidence"],
+            ttl_minutes=knowledge_data["ttl_minutes"]
         )
         
         # Armazena conhecimento
         self.knowledge[topic] = entry
-        self._save_knowledge()
+        self._save_entry(topic)
         
         logger.info(f"✅ LEARNED: {topic} (Confidence: {entry.confidence*100:.1f}%)")
         
@@ -118,19 +314,16 @@ class WebLearningAgent:
         query = f"Explain {topic} in the context of financial markets and trading. Include key facts, current trends, and actionable insights."
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    "https://api.perplexity.ai/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.perplexity_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
+            async with perplexity_limiter.slot():
+                completion = await stream_chat_completion(
+                    self.client,
+                    "/chat/completions",
+                    {
                         "model": "sonar-pro",
                         "messages": [
                             {
                                 "role": "system",
-                                "content": "You are a financial research expert. Provide accurate, well-sourced information with citations."
+                                "content": _RESEARCH_SYSTEM_PROMPT
                             },
                             {
                                 "role": "user",
@@ -138,21 +331,20 @@ class WebLearningAgent:
                             }
                         ],
                         "return_citations": True
-                    }
+                    },
+                    limiter=perplexity_limiter
                 )
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                knowledge = data['choices'][0]['message']['content']
-                citations = data.get('citations', [])
-                
-                return {
-                    "query": query,
-                    "knowledge": knowledge,
-                    "sources": citations,
-                    "confidence": 0.9 if citations else 0.7
-                }
+            
+            ttl_minutes, knowledge = _parse_ttl_header(completion["content"])
+            citations = completion["citations"]
+            
+            return {
+                "query": query,
+                "knowledge": knowledge,
+                "sources": citations,
+                "confidence": 0.9 if citations else 0.7,
+                "ttl_minutes": ttl_minutes
+            }
         
         except Exception as e:
             logger.error(f"Research failed: {e}")
@@ -160,7 +352,8 @@ class WebLearningAgent:
                 "query": query,
                 "knowledge": f"Failed to learn about {topic}: {str(e)}",
                 "sources": [],
-                "confidence": 0.0
+                "confidence": 0.0,
+                "ttl_minutes": 0  # falha não deve ficar em cache
             }
     
     async def apply_knowledge(self, context: str) -> Dict[str, Any]:
@@ -176,11 +369,20 @@ class WebLearningAgent:
         # Identifica tópicos relevantes
         relevant_topics = self._identify_relevant_topics(context)
         
-        # Aprende sobre tópicos que não conhece
-        knowledge_entries = []
-        for topic in relevant_topics:
-            entry = await self.learn_about(topic)
-            knowledge_entries.append(entry)
+        # Aprende sobre tópicos que não conhece (em paralelo). O TaskGroup cancela
+        # as irmãs se uma falhar, liberando as vagas do pool/limitador na hora
+        tasks: List[asyncio.Task] = []
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self.learn_about(topic)) for topic in relevant_topics]
+        except* Exception as eg:
+            # Resultado parcial ainda é útil: segue com os tópicos concluídos
+            logger.warning(f"Partial learning failure ({len(eg.exceptions)} error(s)): {eg.exceptions[0]}")
+        
+        knowledge_entries = [
+            t.result() for t in tasks
+            if t.done() and not t.cancelled() and t.exception() is None
+        ]
         
         # Combina conhecimentos
         combined_knowledge = self._combine_knowledge(knowledge_entries)
@@ -195,31 +397,12 @@ class WebLearningAgent:
     
     def _identify_relevant_topics(self, context: str) -> List[str]:
         """Identifica tópicos relevantes no contexto"""
-        context_lower = context.lower()
-        
-        # Tópicos base sempre relevantes
-        topics = []
-        
         # Detecta ticker
-        words = context.split()
-        for word in words:
-            if word.isupper() and len(word) <= 5:
-                topics.append(f"{word} stock analysis")
+        topics = [f"{ticker} stock analysis" for ticker in dict.fromkeys(_TICKER_RE.findall(context))]
         
         # Detecta conceitos financeiros
-        financial_concepts = {
-            "sentiment": "market sentiment analysis",
-            "volatility": "market volatility",
-            "risk": "risk management",
-            "technical": "technical analysis",
-            "fundamental": "fundamental analysis",
-            "earnings": "earnings reports",
-            "dividend": "dividend investing"
-        }
-        
-        for keyword, topic in financial_concepts.items():
-            if keyword in context_lower:
-                topics.append(topic)
+        found = {match.lower() for match in _CONCEPT_RE.findall(context)}
+        topics.extend(topic for keyword, topic in _FINANCIAL_CONCEPTS.items() if keyword in found)
         
         return topics[:3]  # Limita a 3 tópicos mais relevantes
     
@@ -250,3 +433,11 @@ class WebLearningAgent:
             "most_used_count": most_used.use_count,
             "total_sources": sum(len(e.sources) for e in self.knowledge.values())
         }
+
+    async def close(self):
+        """Grava contadores pendentes e fecha o cliente HTTP compartilhado"""
+        self.flush_usage()
+        await self.client.aclose()
+        # O próximo WebLearningAgent() cria um cliente novo
+        if WebLearningAgent._instance is self:
+            WebLearningAgent._instance = None
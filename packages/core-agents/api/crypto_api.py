@@ -12,16 +12,25 @@ Fornece acesso às funcionalidades criptográficas do Bitcoin:
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-import sys
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Literal, Optional, Dict, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
 import os
+import time
+import timeit
 
-# Adiciona path para importar módulos
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+try:
+    from blake3 import blake3 as _fingerprint_hash
+except ImportError:
+    # blake2b (stdlib) também é bem mais rápido que SHA-256 para fingerprint
+    _fingerprint_hash = hashlib.blake2b
 
 from cryptography.bitcoin_crypto import (
-    sha256, double_sha256, hash160,
+    sha256, double_sha256, triple_digest,
     generate_private_key, private_key_to_public_key,
     sign_message, verify_signature,
     public_key_to_address, private_key_to_wif,
@@ -31,7 +40,56 @@ from cryptography.bitcoin_crypto import (
 )
 
 # Router
-router = APIRouter(prefix="/crypto", tags=["crypto"])
+router = APIRouter(prefix="/crypto", tags=["crypto"], default_response_class=ORJSONResponse)
+
+# Pool de processos para trabalho CPU-bound (PoW, benchmark): não bloqueia o event loop
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    """Cria o pool na primeira utilização (um worker por núcleo)"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _cpu_pool
+
+
+def shutdown_cpu_pool():
+    """Encerra o pool de processos (chamado no shutdown da aplicação)"""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(cancel_futures=True)
+        _cpu_pool = None
+
+
+# Cache LRU de Merkle Trees por fingerprint da lista de transações
+_MERKLE_CACHE: "OrderedDict[bytes, MerkleTree]" = OrderedDict()
+_MERKLE_CACHE_SIZE = 64
+
+
+def _get_merkle_tree(transactions: List[str]) -> MerkleTree:
+    """Retorna a Merkle Tree das transações, reconstruindo só em cache miss"""
+    # Codifica uma vez só (UTF-8), reaproveitado no fingerprint e nas folhas
+    encoded = list(map(str.encode, transactions))
+    
+    fingerprint = _fingerprint_hash()
+    for data in encoded:
+        # Prefixo de tamanho evita colisão entre ["ab", "c"] e ["a", "bc"]
+        fingerprint.update(len(data).to_bytes(8, 'little'))
+        fingerprint.update(data)
+    key = fingerprint.digest()
+    
+    tree = _MERKLE_CACHE.get(key)
+    if tree is not None:
+        _MERKLE_CACHE.move_to_end(key)
+        return tree
+    
+    # map() mantém a iteração em C
+    tree = MerkleTree(list(map(double_sha256, encoded)))
+    _MERKLE_CACHE[key] = tree
+    if len(_MERKLE_CACHE) > _MERKLE_CACHE_SIZE:
+        _MERKLE_CACHE.popitem(last=False)
+    return tree
 
 
 # ============================================================================
@@ -40,7 +98,7 @@ router = APIRouter(prefix="/crypto", tags=["crypto"])
 
 class HashRequest(BaseModel):
     data: str
-    encoding: str = "utf-8"
+    encoding: Literal["utf-8", "hex", "base64"] = "utf-8"
 
 
 class HashResponse(BaseModel):
@@ -84,7 +142,7 @@ class VerifyResponse(BaseModel):
 
 
 class MerkleTreeRequest(BaseModel):
-    transactions: List[str]
+    transactions: Annotated[List[str], Field(min_length=1)]
 
 
 class MerkleTreeResponse(BaseModel):
@@ -93,8 +151,14 @@ class MerkleTreeResponse(BaseModel):
 
 
 class MerkleProofRequest(BaseModel):
-    transactions: List[str]
-    transaction_index: int
+    transactions: Annotated[List[str], Field(min_length=1)]
+    transaction_index: Annotated[int, Field(ge=0)]
+    
+    @model_validator(mode="after")
+    def _index_in_range(self):
+        if self.transaction_index >= len(self.transactions):
+            raise ValueError("Invalid transaction index")
+        return self
 
 
 class MerkleProofResponse(BaseModel):
@@ -105,7 +169,8 @@ class MerkleProofResponse(BaseModel):
 
 class ProofOfWorkRequest(BaseModel):
     data: str
-    difficulty: int
+    # Acima de 32 bits leva tempo demais
+    difficulty: Annotated[int, Field(ge=1, le=32)]
 
 
 class ProofOfWorkResponse(BaseModel):
@@ -138,6 +203,8 @@ async def crypto_info():
     }
 
 
+# /hash, /generate-keypair, /sign e /verify retornam ORJSONResponse direto:
+# o response_model fica só para o OpenAPI e o dict não é revalidado a cada request
 @router.post("/hash", response_model=HashResponse)
 async def hash_data(request: HashRequest):
     """
@@ -155,18 +222,16 @@ async def hash_data(request: HashRequest):
             import base64
             data_bytes = base64.b64decode(request.data)
         else:
-            data_bytes = request.data.encode(request.encoding)
+            data_bytes = request.data.encode("utf-8")
         
-        # Calcula hashes
-        sha256_hash = sha256(data_bytes)
-        double_sha256_hash = double_sha256(data_bytes)
-        hash160_hash = hash160(data_bytes)
+        # Calcula hashes (SHA-256 da entrada compartilhado pelos três)
+        sha256_hash, double_sha256_hash, hash160_hash = triple_digest(data_bytes)
         
-        return {
+        return ORJSONResponse({
             "sha256": sha256_hash.hex(),
             "double_sha256": double_sha256_hash.hex(),
             "hash160": hash160_hash.hex()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -195,14 +260,14 @@ async def generate_keypair(network: str = "mainnet"):
         # Gera WIF
         wif = private_key_to_wif(private_key, compressed=True, network=net)
         
-        return {
+        return ORJSONResponse({
             "private_key": hex(private_key),
             "public_key_x": hex(public_key.x),
             "public_key_y": hex(public_key.y),
             "public_key_compressed": point_compress(public_key).hex(),
             "address": address,
             "wif": wif
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -224,12 +289,12 @@ async def sign_message_endpoint(request: SignRequest):
         message_bytes = request.message.encode('utf-8')
         signature = sign_message(message_bytes, private_key)
         
-        return {
+        return ORJSONResponse({
             "message": request.message,
             "signature_r": hex(signature.r),
             "signature_s": hex(signature.s),
             "signature_der": signature.to_der().hex()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -261,10 +326,10 @@ async def verify_signature_endpoint(request: VerifyRequest):
         message_bytes = request.message.encode('utf-8')
         is_valid = verify_signature(message_bytes, signature, public_key)
         
-        return {
+        return ORJSONResponse({
             "valid": is_valid,
             "message": "Signature is valid" if is_valid else "Signature is invalid"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -278,14 +343,8 @@ async def create_merkle_tree(request: MerkleTreeRequest):
         transactions: Lista de transações (strings)
     """
     try:
-        if not request.transactions:
-            raise HTTPException(status_code=400, detail="Transactions list cannot be empty")
-        
-        # Converte transações para hashes
-        tx_hashes = [double_sha256(tx.encode('utf-8')) for tx in request.transactions]
-        
-        # Cria Merkle Tree
-        merkle_tree = MerkleTree(tx_hashes)
+        # Merkle Tree (cacheada por lista de transações)
+        merkle_tree = _get_merkle_tree(request.transactions)
         root = merkle_tree.get_root()
         
         return {
@@ -306,17 +365,8 @@ async def generate_merkle_proof(request: MerkleProofRequest):
         transaction_index: Índice da transação para gerar prova
     """
     try:
-        if not request.transactions:
-            raise HTTPException(status_code=400, detail="Transactions list cannot be empty")
-        
-        if request.transaction_index < 0 or request.transaction_index >= len(request.transactions):
-            raise HTTPException(status_code=400, detail="Invalid transaction index")
-        
-        # Converte transações para hashes
-        tx_hashes = [double_sha256(tx.encode('utf-8')) for tx in request.transactions]
-        
-        # Cria Merkle Tree
-        merkle_tree = MerkleTree(tx_hashes)
+        # Merkle Tree (cacheada por lista de transações)
+        merkle_tree = _get_merkle_tree(request.transactions)
         
         # Gera prova
         proof = merkle_tree.get_proof(request.transaction_index)
@@ -349,19 +399,16 @@ async def mine_block(request: ProofOfWorkRequest):
         difficulty: Dificuldade (número de bits zero)
     """
     try:
-        if request.difficulty < 1 or request.difficulty > 32:
-            raise HTTPException(
-                status_code=400,
-                detail="Difficulty must be between 1 and 32 (higher values take too long)"
-            )
-        
         # Executa PoW
         data_bytes = request.data.encode('utf-8')
-        nonce, block_hash = proof_of_work(data_bytes, request.difficulty)
+        loop = asyncio.get_running_loop()
+        nonce, block_hash = await loop.run_in_executor(
+            _get_cpu_pool(), proof_of_work, data_bytes, request.difficulty
+        )
         
-        # Conta zeros iniciais
-        hash_bin = bin(int.from_bytes(block_hash, 'big'))[2:].zfill(256)
-        leading_zeros = len(hash_bin) - len(hash_bin.lstrip('0'))
+        # Conta zeros iniciais (bits) direto no inteiro
+        hash_int = int.from_bytes(block_hash, 'big')
+        leading_zeros = 256 - hash_int.bit_length()
         
         return {
             "nonce": nonce,
@@ -397,13 +444,8 @@ async def verify_pow(data: str, nonce: int, difficulty: int):
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/security-analysis")
-async def security_analysis():
-    """
-    Retorna análise de segurança do sistema criptográfico
-    """
-    import math
-    
+def _build_security_analysis() -> Dict:
+    """Monta a análise de segurança (constante: calculada uma vez no import)"""
     # Estimativas de segurança
     sha256_bits = 256
     ecdsa_bits = 256
@@ -472,53 +514,76 @@ async def security_analysis():
     }
 
 
+_SECURITY_ANALYSIS = _build_security_analysis()
+
+
+@router.get("/security-analysis")
+async def security_analysis():
+    """
+    Retorna análise de segurança do sistema criptográfico
+    """
+    return ORJSONResponse(
+        content=_SECURITY_ANALYSIS,
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+# Resultado do benchmark: (timestamp monotônico, resultados); válido por 1 h
+_benchmark_cache: Optional[Tuple[float, Dict[str, str]]] = None
+_BENCHMARK_TTL = 3600.0
+
+
 @router.get("/benchmark")
-async def benchmark_crypto():
+async def benchmark_crypto(force: bool = False):
     """
     Executa benchmark das operações criptográficas
+    
+    Args:
+        force: Ignora o resultado em cache e mede novamente
     """
-    import time
+    global _benchmark_cache
+    
+    cached = _benchmark_cache
+    if force or cached is None or time.monotonic() - cached[0] > _BENCHMARK_TTL:
+        # Roda inteiro em um worker do pool: mede a CPU sem travar o event loop
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(_get_cpu_pool(), _run_benchmark)
+        _benchmark_cache = cached = (time.monotonic(), results)
     
+    return {
+        "benchmark_results": cached[1],
+        "note": "Times are averages over multiple iterations"
+    }
+
+
+def _time_per_op(func) -> float:
+    """Tempo médio por chamada; timeit.autorange escolhe o nº de repetições (>= 0.2 s)"""
+    number, total = timeit.Timer(func).autorange()
+    return total / number
+
+
+def _run_benchmark() -> Dict[str, str]:
+    """Loops de benchmark (executados fora do event loop)"""
     results = {}
     
+    def record(name: str, seconds: float):
+        results[f"{name}_per_operation"] = f"{seconds * 1000:.3f} ms"
+        results[f"{name}_ops_per_second"] = f"{1/seconds:.0f}"
+    
     # Benchmark: Hash
-    start = time.time()
-    for _ in range(10000):
-        sha256(b"test data")
-    hash_time = (time.time() - start) / 10000
-    results["sha256_per_operation"] = f"{hash_time * 1000:.3f} ms"
-    results["sha256_ops_per_second"] = f"{1/hash_time:.0f}"
+    record("sha256", _time_per_op(lambda: sha256(b"test data")))
     
     # Benchmark: Key generation
-    start = time.time()
-    for _ in range(100):
-        private_key = generate_private_key()
-        public_key = private_key_to_public_key(private_key)
-    keygen_time = (time.time() - start) / 100
-    results["keygen_per_operation"] = f"{keygen_time * 1000:.3f} ms"
-    results["keygen_ops_per_second"] = f"{1/keygen_time:.0f}"
+    record("keygen", _time_per_op(lambda: private_key_to_public_key(generate_private_key())))
     
     # Benchmark: Signing
     private_key = generate_private_key()
     message = b"test message"
-    start = time.time()
-    for _ in range(100):
-        sign_message(message, private_key)
-    sign_time = (time.time() - start) / 100
-    results["sign_per_operation"] = f"{sign_time * 1000:.3f} ms"
-    results["sign_ops_per_second"] = f"{1/sign_time:.0f}"
+    record("sign", _time_per_op(lambda: sign_message(message, private_key)))
     
     # Benchmark: Verification
     public_key = private_key_to_public_key(private_key)
     signature = sign_message(message, private_key)
-    start = time.time()
-    for _ in range(100):
-        verify_signature(message, signature, public_key)
-    verify_time = (time.time() - start) / 100
-    results["verify_per_operation"] = f"{verify_time * 1000:.3f} ms"
-    results["verify_ops_per_second"] = f"{1/verify_time:.0f}"
+    record("verify", _time_per_op(lambda: verify_signature(message, signature, public_key)))
     
-    return {
-        "benchmark_results": results,
-        "note": "Times are averages over multiple iterations"
-    }
+    return results
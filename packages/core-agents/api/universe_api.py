@@ -7,27 +7,28 @@ fornecendo dados em tempo real sobre estados, energias, ressonâncias
 e acoplamentos.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Optional
+from functools import lru_cache
 from pydantic import BaseModel
-import sys
-import os
-
-# Adiciona path para importar módulos
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
 
 from mathematics.universe_calculus import (
+    STATE_FIELDS,
     UniverseCalculus,
     compute_correlation_matrix,
     compute_phase_space_trajectory,
 )
 
-# Instância global do sistema de universos
-universe_system = UniverseCalculus()
+# Sistema de universos do processo: criado no primeiro request que o usa
+@lru_cache(maxsize=1)
+def get_universe_system() -> UniverseCalculus:
+    """Dependência FastAPI que retorna a instância compartilhada"""
+    return UniverseCalculus()
 
 # Router
-router = APIRouter(prefix="/universe", tags=["universe"])
+router = APIRouter(prefix="/universe", tags=["universe"], default_response_class=ORJSONResponse)
 
 
 # ============================================================================
@@ -82,7 +83,7 @@ class PhaseSpaceResponse(BaseModel):
 # ============================================================================
 
 @router.get("/")
-async def universe_info():
+async def universe_info(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Informações sobre o sistema de universos"""
     return {
         "system": "32 Universe Mathematical System",
@@ -104,7 +105,7 @@ async def universe_info():
 
 
 @router.get("/states", response_model=List[UniverseStateResponse])
-async def get_all_states():
+async def get_all_states(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna estados de todos os 32 universos"""
     try:
         states = universe_system.get_all_states()
@@ -114,7 +115,7 @@ async def get_all_states():
 
 
 @router.get("/state/{universe_id}", response_model=UniverseStateResponse)
-async def get_universe_state(universe_id: int):
+async def get_universe_state(universe_id: int, universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna estado de um universo específico"""
     if universe_id < 0 or universe_id >= len(universe_system.universes):
         raise HTTPException(status_code=404, detail="Universe not found")
@@ -127,7 +128,8 @@ async def get_universe_state(universe_id: int):
 
 
 @router.post("/evolve")
-async def evolve_system(steps: int = 1, dt: Optional[float] = None):
+async def evolve_system(steps: int = 1, dt: Optional[float] = None,
+                        universe_system: UniverseCalculus = Depends(get_universe_system)):
     """
     Evolui o sistema por N passos temporais
     
@@ -139,8 +141,7 @@ async def evolve_system(steps: int = 1, dt: Optional[float] = None):
         raise HTTPException(status_code=400, detail="Steps must be between 1 and 10000")
     
     try:
-        for _ in range(steps):
-            universe_system.evolve_step(dt=dt)
+        universe_system.evolve_n_steps(steps, dt)
         
         return {
             "status": "success",
@@ -153,7 +154,7 @@ async def evolve_system(steps: int = 1, dt: Optional[float] = None):
 
 
 @router.get("/metrics", response_model=SystemMetricsResponse)
-async def get_system_metrics():
+async def get_system_metrics(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna métricas globais do sistema"""
     try:
         return {
@@ -167,7 +168,7 @@ async def get_system_metrics():
 
 
 @router.get("/resonances", response_model=List[ResonanceResponse])
-async def get_resonances(top_n: int = 10):
+async def get_resonances(top_n: int = 10, universe_system: UniverseCalculus = Depends(get_universe_system)):
     """
     Retorna principais ressonâncias entre universos
     
@@ -200,28 +201,28 @@ async def get_resonances(top_n: int = 10):
 
 
 @router.get("/correlation", response_model=CorrelationResponse)
-async def get_correlation_matrix():
+async def get_correlation_matrix(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna matriz de correlação entre universos"""
     try:
         t = universe_system.time
         correlation = compute_correlation_matrix(universe_system, t)
         
-        # Converte numpy array para lista
-        matrix = correlation.tolist()
-        
         # Nomes dos universos
         names = [u.name for u in universe_system.universes]
         
-        return {
-            "matrix": matrix,
+        # Resposta direta: orjson serializa o ndarray sem passar por listas
+        # Python (response_model fica só para a documentação)
+        return ORJSONResponse({
+            "matrix": correlation,
             "universe_names": names
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/phase-space/{universe_id}", response_model=PhaseSpaceResponse)
-async def get_phase_space(universe_id: int, t_max: float = 100.0, n_points: int = 1000):
+async def get_phase_space(universe_id: int, t_max: float = 100.0, n_points: int = 1000,
+                          universe_system: UniverseCalculus = Depends(get_universe_system)):
     """
     Retorna trajetória no espaço de fase (φ, dφ/dt)
     
@@ -237,27 +238,27 @@ async def get_phase_space(universe_id: int, t_max: float = 100.0, n_points: int
         raise HTTPException(status_code=400, detail="n_points must be between 10 and 10000")
     
     try:
-        import numpy as np
-        
         phi_values, dphi_values = compute_phase_space_trajectory(
             universe_system, universe_id, t_max, n_points
         )
         
         time_values = np.linspace(0, t_max, n_points)
         
-        return {
+        # ndarrays vão direto para o orjson (ver get_correlation_matrix)
+        return ORJSONResponse({
             "universe_id": universe_id,
             "universe_name": universe_system.universes[universe_id].name,
-            "phi_values": phi_values.tolist(),
-            "dphi_values": dphi_values.tolist(),
-            "time_values": time_values.tolist()
-        }
+            "phi_values": phi_values,
+            "dphi_values": dphi_values,
+            "time_values": time_values
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/spectrum/{universe_id}")
-async def get_fourier_spectrum(universe_id: int, t_max: float = 100.0, n_samples: int = 10000):
+async def get_fourier_spectrum(universe_id: int, t_max: float = 100.0, n_samples: int = 10000,
+                               universe_system: UniverseCalculus = Depends(get_universe_system)):
     """
     Retorna espectro de Fourier de um universo
     
@@ -270,26 +271,34 @@ async def get_fourier_spectrum(universe_id: int, t_max: float = 100.0, n_samples
         raise HTTPException(status_code=404, detail="Universe not found")
     
     try:
+        # Tamanhos com fatores primos grandes caem no caminho lento (Bluestein);
+        # arredonda para o próximo tamanho rápido (produto de 2, 3 e 5)
+        from scipy.fft import next_fast_len
+        n_samples = next_fast_len(n_samples, real=True)
+        
         frequencies, amplitudes = universe_system.compute_fourier_spectrum(
             universe_id, t_max, n_samples
         )
         
-        # Pega apenas os 50 picos mais fortes
-        top_indices = amplitudes.argsort()[-50:][::-1]
+        # Pega apenas os 50 picos mais fortes: seleção parcial O(N), depois
+        # ordena só esses
+        k = min(50, amplitudes.size)
+        top_indices = np.argpartition(amplitudes, -k)[-k:]
+        top_indices = top_indices[np.argsort(amplitudes[top_indices])[::-1]]
         
         return {
             "universe_id": universe_id,
             "universe_name": universe_system.universes[universe_id].name,
             "frequencies": frequencies[top_indices].tolist(),
             "amplitudes": amplitudes[top_indices].tolist(),
-            "dominant_frequency": float(frequencies[amplitudes.argmax()])
+            "dominant_frequency": float(frequencies[top_indices[0]])
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/coupling-matrix")
-async def get_coupling_matrix():
+async def get_coupling_matrix(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna matriz de acoplamento entre universos"""
     try:
         matrix = universe_system.coupling_matrix.tolist()
@@ -305,43 +314,43 @@ async def get_coupling_matrix():
 
 
 @router.get("/positions")
-async def get_universe_positions():
+async def get_universe_positions(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """
     Retorna posições 3D dos universos para visualização
     
     Distribui universos em uma esfera usando espiral de Fibonacci
     """
-    import math
-    
-    n = len(universe_system.universes)
-    positions = []
+    universes = universe_system.universes
+    n = len(universes)
     
     # Espiral de Fibonacci para distribuição uniforme em esfera
-    phi = (1 + math.sqrt(5)) / 2  # Golden ratio
+    phi = (1 + np.sqrt(5)) / 2  # Golden ratio
+    i = np.arange(n)
+    theta = 2 * np.pi * i / phi                   # Ângulo azimutal
+    phi_angle = np.arccos(1 - 2 * (i + 0.5) / n)  # Ângulo polar
     
-    for i in range(n):
-        # Ângulo azimutal
-        theta = 2 * math.pi * i / phi
-        
-        # Ângulo polar
-        phi_angle = math.acos(1 - 2 * (i + 0.5) / n)
-        
-        # Raio (varia com energia)
-        u = universe_system.universes[i]
-        radius = 5.0 + u.energy * 2.0
-        
-        # Coordenadas cartesianas
-        x = radius * math.sin(phi_angle) * math.cos(theta)
-        y = radius * math.sin(phi_angle) * math.sin(theta)
-        z = radius * math.cos(phi_angle)
-        
-        positions.append({
-            "id": i,
+    # Raio (varia com energia)
+    energies = np.fromiter((u.energy for u in universes), dtype=np.float64, count=n)
+    radius = 5.0 + energies * 2.0
+    
+    # Coordenadas cartesianas, uma linha [x, y, z] por universo
+    sin_phi = np.sin(phi_angle)
+    xyz = np.column_stack((
+        radius * sin_phi * np.cos(theta),
+        radius * sin_phi * np.sin(theta),
+        radius * np.cos(phi_angle),
+    )).tolist()
+    
+    positions = [
+        {
+            "id": idx,
             "name": u.name,
-            "position": [x, y, z],
+            "position": xyz[idx],
             "energy": u.energy,
             "frequency": u.frequency
-        })
+        }
+        for idx, u in enumerate(universes)
+    ]
     
     return {
         "positions": positions,
@@ -353,10 +362,9 @@ async def get_universe_positions():
 @router.post("/reset")
 async def reset_system():
     """Reinicia o sistema de universos"""
-    global universe_system
-    
     try:
-        universe_system = UniverseCalculus()
+        get_universe_system.cache_clear()
+        universe_system = get_universe_system()
         
         return {
             "status": "success",
@@ -373,7 +381,7 @@ async def reset_system():
 
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
-import json
+import orjson
 
 @router.websocket("/ws/stream")
 async def websocket_stream(websocket: WebSocket):
@@ -381,31 +389,46 @@ async def websocket_stream(websocket: WebSocket):
     WebSocket para streaming de dados em tempo real
     
     Envia estados de todos os universos a cada 100ms
+    
+    A primeira mensagem ("universe_init") traz os dados estáticos (nomes,
+    frequências, acoplamento). As seguintes ("universe_update") trazem só
+    uma linha numérica por universo, na ordem de "fields".
     """
     await websocket.accept()
     
     try:
+        universe_system = get_universe_system()
+        await websocket.send_text(orjson.dumps({
+            "type": "universe_init",
+            "ids": [u.id for u in universe_system.universes],
+            "names": [u.name for u in universe_system.universes],
+            "frequencies": [u.frequency for u in universe_system.universes],
+            "coupling": universe_system.coupling_matrix,
+            "fields": STATE_FIELDS,
+        }, option=orjson.OPT_SERIALIZE_NUMPY).decode())
+        
         while True:
+            # Resolve a cada frame: POST /reset troca a instância compartilhada
+            universe_system = get_universe_system()
+            
             # Evolui sistema
             universe_system.evolve_step()
             
             # Coleta dados
-            states = universe_system.get_all_states()
-            metrics = {
-                "total_energy": universe_system.compute_total_energy(),
-                "coupling_energy": universe_system.compute_coupling_energy(),
-                "time": universe_system.time
-            }
-            
-            # Envia dados
+            total_energy, coupling_energy = universe_system.compute_energies()
             data = {
                 "type": "universe_update",
-                "states": states,
-                "metrics": metrics,
+                "states": universe_system.state_arrays(),
+                "metrics": {
+                    "total_energy": total_energy,
+                    "coupling_energy": coupling_energy,
+                    "time": universe_system.time
+                },
                 "timestamp": universe_system.time
             }
             
-            await websocket.send_json(data)
+            # Envia dados (frame de texto, como send_json)
+            await websocket.send_text(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode())
             
             # Aguarda 100ms
             await asyncio.sleep(0.1)
@@ -421,32 +444,27 @@ async def websocket_stream(websocket: WebSocket):
 # BACKGROUND TASK: Evolução Contínua
 # ============================================================================
 
-import threading
-import time as time_module
-
-_evolution_thread = None
+_evolution_task: Optional[asyncio.Task] = None
 _evolution_running = False
 
-def evolution_loop():
-    """Loop de evolução contínua em background"""
-    global universe_system, _evolution_running
-    
+async def evolution_loop():
+    """Loop de evolução contínua, como task no mesmo event loop da API"""
     while _evolution_running:
-        universe_system.evolve_step(dt=0.01)
-        time_module.sleep(0.01)  # 100 FPS
+        # Resolve a cada passo: segue a nova instância após /reset
+        get_universe_system().evolve_step(dt=0.01)
+        await asyncio.sleep(0.01)  # 100 FPS
 
 
 @router.post("/start-evolution")
 async def start_evolution():
     """Inicia evolução contínua em background"""
-    global _evolution_thread, _evolution_running
+    global _evolution_task, _evolution_running
     
     if _evolution_running:
         return {"status": "already_running", "message": "Evolution is already running"}
     
     _evolution_running = True
-    _evolution_thread = threading.Thread(target=evolution_loop, daemon=True)
-    _evolution_thread.start()
+    _evolution_task = asyncio.get_running_loop().create_task(evolution_loop())
     
     return {
         "status": "started",
@@ -456,14 +474,16 @@ async def start_evolution():
 
 
 @router.post("/stop-evolution")
-async def stop_evolution():
+async def stop_evolution(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Para evolução contínua"""
-    global _evolution_running
+    global _evolution_task, _evolution_running
     
     if not _evolution_running:
         return {"status": "not_running", "message": "Evolution is not running"}
     
     _evolution_running = False
+    _evolution_task.cancel()
+    _evolution_task = None
     
     return {
         "status": "stopped",
@@ -473,7 +493,7 @@ async def stop_evolution():
 
 
 @router.get("/evolution-status")
-async def get_evolution_status():
+async def get_evolution_status(universe_system: UniverseCalculus = Depends(get_universe_system)):
     """Retorna status da evolução contínua"""
     return {
         "running": _evolution_running,
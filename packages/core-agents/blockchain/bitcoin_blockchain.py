@@ -19,10 +19,13 @@ Bitcoin é a ponte: um sistema que evolui através de consenso matemático.
 """
 
 import time
-import json
+import hashlib
+import struct
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import sys
 import os
 
@@ -37,17 +40,48 @@ try:
         generate_private_key, private_key_to_public_key,
         sign_message, verify_signature,
         public_key_to_address, Point, Signature,
-        MerkleTree, proof_of_work, verify_proof_of_work
+        merkle_root, proof_of_work, verify_proof_of_work
     )
 except ImportError as e:
     print(f"Import error: {e}")
     raise
 
+@lru_cache(maxsize=4096)
+def _decode_public_key(public_key_hex: str) -> Tuple[Point, str]:
+    """
+    Chave pública hex (x || y) -> (Point, endereço)
+    
+    Memoizada: inputs gastos pela mesma carteira repetem a chave, e o
+    endereço custa SHA-256 + RIPEMD-160 a cada derivação.
+    """
+    public_key = Point(int(public_key_hex[:64], 16), int(public_key_hex[64:], 16))
+    return public_key, public_key_to_address(public_key)
+
 
 # ============================================================================
 # TRANSACTION: Unidade básica de transferência
 # ============================================================================
 
+_TX_COUNTS_FORMAT = struct.Struct('<II')
+_INDEX_FORMAT = struct.Struct('<q')
+_AMOUNT_FORMAT = struct.Struct('<d')
+_STR_LEN_FORMAT = struct.Struct('<I')
+_NO_STR = b'\xff\xff\xff\xff'  # marca None, distinto de string vazia
+
+
+# Chave do UTXO set: (hash da transação em bytes, índice da saída)
+UTXOKey = Tuple[bytes, int]
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode('utf-8')
+    return _STR_LEN_FORMAT.pack(len(raw)) + raw
+
+
+def _pack_optional_str(value: Optional[str]) -> bytes:
+    return _NO_STR if value is None else _pack_str(value)
+
+
 @dataclass
 class TransactionInput:
     prev_tx_hash: str
@@ -55,6 +89,10 @@ class TransactionInput:
     signature: Optional[str] = None
     public_key: Optional[str] = None
     
+    def __post_init__(self):
+        # Chave no UTXO set, calculada uma vez (não é campo: fica fora de to_dict)
+        self.utxo_key: UTXOKey = (bytes.fromhex(self.prev_tx_hash), self.output_index)
+    
     def to_dict(self) -> dict:
         return asdict(self)
 
@@ -68,14 +106,17 @@ class TransactionOutput:
 
 @dataclass
 class Transaction:
+    # tx_hash é sempre derivado do conteúdo em __post_init__ (não é argumento
+    # do construtor) e reutilizado em sign. Como exclui as assinaturas, assinar
+    # não o invalida; verify o recalcula e rejeita a transação se inputs/outputs
+    # tiverem sido alterados depois da construção.
     inputs: List[TransactionInput]
     outputs: List[TransactionOutput]
     timestamp: float = field(default_factory=time.time)
-    tx_hash: Optional[str] = None
+    tx_hash: str = field(init=False)
 
     def __post_init__(self):
-        if self.tx_hash is None:
-            self.tx_hash = self.calculate_hash()
+        self.tx_hash = self.calculate_hash()
 
     def calculate_hash(self) -> str:
         # O hash de uma transação é calculado sobre seu conteúdo *sem* as assinaturas.
@@ -83,49 +124,62 @@ class Transaction:
         return double_sha256(data).hex()
 
     def serialize(self, include_signatures: bool = True) -> bytes:
-        inputs_serializable = []
+        """
+        Forma binária canônica (little-endian, strings com prefixo de tamanho):
+        n_inputs | n_outputs | inputs... | outputs... | timestamp
+        """
+        parts = [_TX_COUNTS_FORMAT.pack(len(self.inputs), len(self.outputs))]
         for inp in self.inputs:
-            inp_dict = inp.to_dict()
-            if not include_signatures:
-                inp_dict['signature'] = None
-                inp_dict['public_key'] = None
-            inputs_serializable.append(inp_dict)
-
-        data = {
-            'inputs': inputs_serializable,
-            'outputs': [out.to_dict() for out in self.outputs],
-            'timestamp': self.timestamp
-        }
-        return json.dumps(data, sort_keys=True).encode('utf-8')
-
-    def sign(self, private_key: int, utxo_set: Dict[str, 'TransactionOutput']):
+            parts.append(_pack_str(inp.prev_tx_hash))
+            parts.append(_INDEX_FORMAT.pack(inp.output_index))
+            if include_signatures:
+                parts.append(_pack_optional_str(inp.signature))
+                parts.append(_pack_optional_str(inp.public_key))
+            else:
+                parts.append(_NO_STR)
+                parts.append(_NO_STR)
+        for out in self.outputs:
+            parts.append(_AMOUNT_FORMAT.pack(out.amount))
+            parts.append(_pack_str(out.recipient_address))
+        parts.append(_AMOUNT_FORMAT.pack(self.timestamp))
+        return b''.join(parts)
+
+    def sign(self, private_key: int, utxo_set: Dict[UTXOKey, 'TransactionOutput']):
         public_key = private_key_to_public_key(private_key)
         address = public_key_to_address(public_key)
+        # A mensagem a ser assinada é o hash da transação sem nenhuma assinatura.
+        message_bytes = bytes.fromhex(self.tx_hash)
 
         for i, inp in enumerate(self.inputs):
-            utxo_key = f"{inp.prev_tx_hash}:{inp.output_index}"
-            if utxo_key in utxo_set and utxo_set[utxo_key].recipient_address == address:
-                # A mensagem a ser assinada é o hash da transação sem nenhuma assinatura.
-                message_to_sign = self.calculate_hash()
-                message_bytes = bytes.fromhex(message_to_sign)
-                
+            utxo = utxo_set.get(inp.utxo_key)
+            if utxo is not None and utxo.recipient_address == address:
                 signature = sign_message(message_bytes, private_key)
                 
                 self.inputs[i].signature = f"{signature.r:064x}{signature.s:064x}"
                 self.inputs[i].public_key = f"{public_key.x:064x}{public_key.y:064x}"
 
-    def verify(self, utxo_set: Dict[str, 'TransactionOutput']) -> bool:
+    def verify(self, utxo_set: Dict[UTXOKey, 'TransactionOutput']) -> bool:
         total_input = 0.0
-        message_to_verify = self.calculate_hash()
-        message_bytes = bytes.fromhex(message_to_verify)
+        # As assinaturas cobrem o conteúdo atual, não o tx_hash guardado
+        tx_hash = self.calculate_hash()
+        if tx_hash != self.tx_hash:
+            print("[VERIFY] ERRO: tx_hash não corresponde ao conteúdo da transação.")
+            return False
+        message_bytes = bytes.fromhex(tx_hash)
+        spent: set = set()
 
         for inp in self.inputs:
-            utxo_key = f"{inp.prev_tx_hash}:{inp.output_index}"
-            if utxo_key not in utxo_set:
-                print(f"[VERIFY] ERRO: UTXO não encontrado: {utxo_key}")
+            # O mesmo UTXO duas vezes na transação seria gasto em dobro
+            if inp.utxo_key in spent:
+                print(f"[VERIFY] ERRO: UTXO referenciado mais de uma vez: {inp.prev_tx_hash}:{inp.output_index}")
+                return False
+            spent.add(inp.utxo_key)
+
+            utxo = utxo_set.get(inp.utxo_key)
+            if utxo is None:
+                print(f"[VERIFY] ERRO: UTXO não encontrado: {inp.prev_tx_hash}:{inp.output_index}")
                 return False
             
-            utxo = utxo_set[utxo_key]
             total_input += utxo.amount
 
             if not (inp.signature and inp.public_key):
@@ -137,11 +191,7 @@ class Transaction:
                 s = int(inp.signature[64:], 16)
                 signature = Signature(r, s)
 
-                x = int(inp.public_key[:64], 16)
-                y = int(inp.public_key[64:], 16)
-                public_key = Point(x, y)
-                
-                address = public_key_to_address(public_key)
+                public_key, address = _decode_public_key(inp.public_key)
                 if address != utxo.recipient_address:
                     print(f"[VERIFY] ERRO: Endereço da chave pública não corresponde ao endereço do UTXO.")
                     return False
@@ -160,11 +210,11 @@ class Transaction:
 
         return True
 
-    def get_fee(self, utxo_set: Dict[str, 'TransactionOutput']) -> float:
+    def get_fee(self, utxo_set: Dict[UTXOKey, 'TransactionOutput']) -> float:
         total_input = sum(
-            utxo_set[f"{inp.prev_tx_hash}:{inp.output_index}"].amount
+            utxo_set[inp.utxo_key].amount
             for inp in self.inputs
-            if f"{inp.prev_tx_hash}:{inp.output_index}" in utxo_set
+            if inp.utxo_key in utxo_set
         )
         total_output = sum(out.amount for out in self.outputs)
         return total_input - total_output
@@ -181,6 +231,70 @@ class Transaction:
 # BLOCK: Conjunto de transações
 # ============================================================================
 
+# Cabeçalho binário fixo (88 bytes, little-endian):
+# index(8) | timestamp(8) | merkle_root(32) | previous_hash(32) | difficulty(4) | nonce(4)
+_HEADER_FORMAT = struct.Struct('<Qd32s32sII')
+_NONCE_FORMAT = struct.Struct('<I')
+_NONCE_OFFSET = _HEADER_FORMAT.size - _NONCE_FORMAT.size
+_MAX_NONCE = 0xFFFFFFFF
+_SHA256_BLOCK = 64
+
+# Mineração paralela: faixas de nonce por worker e dificuldade mínima que compensa
+# o custo de despachar para outros processos
+_MINING_CHUNK = 1 << 18
+_PARALLEL_MIN_DIFFICULTY = 20
+
+
+def _scan_nonces(header: bytes, start: int, stop: int, target: int) -> Optional[Tuple[int, bytes]]:
+    """
+    Procura em [start, stop) o primeiro nonce com double-SHA256(header) < target
+    
+    Midstate: os primeiros 64 bytes (um bloco SHA-256) não mudam com o nonce.
+    Comprime-os uma vez e, por nonce, só copia o estado e processa o final.
+    """
+    sha = hashlib.sha256
+    midstate = sha(header[:_SHA256_BLOCK])
+    tail = bytearray(header[_SHA256_BLOCK:])
+    nonce_offset = _NONCE_OFFSET - _SHA256_BLOCK
+    pack_nonce = _NONCE_FORMAT.pack_into
+    # Digests de 32 bytes comparados como bytes têm a ordem dos inteiros
+    # big-endian: sem int de 256 bits por tentativa
+    target_bytes = target.to_bytes(32, 'big')
+    
+    for nonce in range(start, stop):
+        pack_nonce(tail, nonce_offset, nonce)
+        inner = midstate.copy()
+        inner.update(tail)
+        h = sha(inner.digest()).digest()
+        if h < target_bytes:
+            return nonce, h
+    return None
+
+
+def _parallel_scan(header: bytes, start: int, target: int, workers: int) -> Optional[Tuple[int, bytes]]:
+    """
+    Divide o espaço de nonces em faixas entre processos
+    
+    Os resultados são consumidos em ordem, então o nonce vencedor é o
+    mesmo que a busca serial encontraria.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        next_start = start
+        while next_start <= _MAX_NONCE or pending:
+            while len(pending) < 2 * workers and next_start <= _MAX_NONCE:
+                stop = min(next_start + _MINING_CHUNK, _MAX_NONCE + 1)
+                pending.append(pool.submit(_scan_nonces, header, next_start, stop, target))
+                next_start = stop
+            
+            result = pending.popleft().result()
+            if result is not None:
+                return result
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 @dataclass
 class Block:
     index: int
@@ -200,35 +314,61 @@ class Block:
     def calculate_merkle_root(self) -> str:
         if not self.transactions:
             return "0" * 64
-        tx_hashes = [bytes.fromhex(tx.tx_hash) for tx in self.transactions]
-        merkle_tree = MerkleTree(tx_hashes)
-        return merkle_tree.get_root().hex()
+        return merkle_root([bytes.fromhex(tx.tx_hash) for tx in self.transactions]).hex()
+
+    def _calculate_hash_bytes(self) -> bytes:
+        return double_sha256(self.serialize_header())
 
     def calculate_hash(self) -> str:
-        data = self.serialize_header()
-        return double_sha256(data).hex()
+        return self._calculate_hash_bytes().hex()
+
+    @property
+    def target(self) -> int:
+        """Maior hash (como inteiro big-endian) aceito na dificuldade do bloco"""
+        return (1 << (256 - self.difficulty)) - 1
+
+    def _pack_header(self, nonce: int) -> bytearray:
+        """Cabeçalho binário mutável: só o campo nonce muda durante a mineração"""
+        buf = bytearray(_HEADER_FORMAT.size)
+        _HEADER_FORMAT.pack_into(
+            buf, 0,
+            self.index,
+            self.timestamp,
+            bytes.fromhex(self.merkle_root),
+            bytes.fromhex(self.previous_hash),
+            self.difficulty,
+            nonce
+        )
+        return buf
 
     def serialize_header(self) -> bytes:
-        header = {
-            'index': self.index,
-            'timestamp': self.timestamp,
-            'merkle_root': self.merkle_root,
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce,
-            'difficulty': self.difficulty
-        }
-        return json.dumps(header, sort_keys=True).encode('utf-8')
+        return bytes(self._pack_header(self.nonce))
 
-    def mine(self):
+    def mine(self, workers: Optional[int] = None):
+        """
+        Minera o bloco (Proof of Work)
+        
+        Args:
+            workers: Processos para a busca de nonce. Padrão: todos os núcleos
+                     a partir de _PARALLEL_MIN_DIFFICULTY bits, senão serial.
+        """
         print(f"[MINING] Bloco #{self.index} | Dificuldade: {self.difficulty} bits")
         start_time = time.time()
         
-        target = (1 << (256 - self.difficulty)) - 1
-        while True:
-            self.block_hash = self.calculate_hash()
-            if int(self.block_hash, 16) < target:
-                break
-            self.nonce += 1
+        if workers is None:
+            workers = (os.cpu_count() or 1) if self.difficulty >= _PARALLEL_MIN_DIFFICULTY else 1
+        
+        target = self.target
+        header = self.serialize_header()
+        if workers > 1:
+            result = _parallel_scan(header, self.nonce, target, workers)
+        else:
+            result = _scan_nonces(header, self.nonce, _MAX_NONCE + 1, target)
+        
+        if result is None:
+            raise RuntimeError("Mining failed: nonce space exhausted")
+        self.nonce, h = result
+        self.block_hash = h.hex()
 
         elapsed = time.time() - start_time
         hash_rate = self.nonce / elapsed if elapsed > 0 else 0
@@ -239,13 +379,16 @@ class Block:
         print(f"  Tempo: {elapsed:.2f}s")
         print(f"  Taxa: {hash_rate:,.0f} H/s")
 
-    def verify(self) -> bool:
-        target = (1 << (256 - self.difficulty)) - 1
-        if int(self.block_hash, 16) >= target:
+    def verify_pow(self) -> bool:
+        """Só confere o block_hash armazenado contra o alvo (sem re-hash)"""
+        if int(self.block_hash, 16) >= self.target:
             print(f"[VERIFY] ERRO: Hash do bloco não atende à dificuldade.")
             return False
+        return True
 
-        if self.block_hash != self.calculate_hash():
+    def verify_integrity(self) -> bool:
+        """Recalcula hash do cabeçalho e Merkle root e compara com os armazenados"""
+        if bytes.fromhex(self.block_hash) != self._calculate_hash_bytes():
             print(f"[VERIFY] ERRO: Hash do bloco inconsistente.")
             return False
 
@@ -254,6 +397,9 @@ class Block:
             return False
         return True
 
+    def verify(self) -> bool:
+        return self.verify_pow() and self.verify_integrity()
+
     def to_dict(self) -> dict:
         return {
             'index': self.index,
@@ -275,7 +421,9 @@ class Blockchain:
         self.chain: List[Block] = []
         self.difficulty = difficulty
         self.mempool: List[Transaction] = []
-        self.utxo_set: Dict[str, TransactionOutput] = {}
+        self.utxo_set: Dict[UTXOKey, TransactionOutput] = {}
+        # Índice secundário endereço -> UTXOs, mantido junto com utxo_set
+        self._utxos_by_address: Dict[str, Dict[UTXOKey, TransactionOutput]] = defaultdict(dict)
         self.create_genesis_block()
 
     def create_genesis_block(self):
@@ -336,14 +484,22 @@ class Blockchain:
         )
         new_block.mine()
         
-        if self.add_block(new_block):
+        # Bloco minerado aqui mesmo: hash e Merkle root acabaram de ser calculados
+        if self.add_block(new_block, check_integrity=False):
             self.mempool = self.mempool[9:]
             return new_block
         else:
             raise Exception("Mineração falhou ao adicionar bloco válido.")
 
-    def add_block(self, block: Block) -> bool:
-        if not block.verify():
+    def add_block(self, block: Block, check_integrity: bool = True) -> bool:
+        """
+        Anexa um bloco à cadeia
+        
+        check_integrity=False confia em block_hash/merkle_root (blocos
+        minerados localmente); blocos de fora devem ser verificados por inteiro.
+        """
+        valid = block.verify() if check_integrity else block.verify_pow()
+        if not valid:
             print(f"[CHAIN] Bloco #{block.index} inválido.")
             return False
         if block.previous_hash != self.get_latest_block().block_hash:
@@ -357,29 +513,40 @@ class Blockchain:
     def _update_utxo_set(self, block: Block):
         for tx in block.transactions:
             for inp in tx.inputs:
-                utxo_key = f"{inp.prev_tx_hash}:{inp.output_index}"
-                if utxo_key in self.utxo_set:
-                    del self.utxo_set[utxo_key]
+                spent = self.utxo_set.pop(inp.utxo_key, None)
+                if spent is not None:
+                    owned = self._utxos_by_address[spent.recipient_address]
+                    owned.pop(inp.utxo_key, None)
+                    if not owned:
+                        del self._utxos_by_address[spent.recipient_address]
+            tx_hash = bytes.fromhex(tx.tx_hash)
             for i, out in enumerate(tx.outputs):
-                utxo_key = f"{tx.tx_hash}:{i}"
-                self.utxo_set[utxo_key] = out
+                self.utxo_set[(tx_hash, i)] = out
+                self._utxos_by_address[out.recipient_address][(tx_hash, i)] = out
 
-    def verify_chain(self) -> bool:
+    def verify_chain(self, full: bool = True) -> bool:
+        """
+        Confere encadeamento e PoW de cada bloco
+        
+        full=True (auditoria) também recalcula hashes e Merkle roots;
+        full=False confia nos campos armazenados, já verificados em add_block.
+        """
         for i in range(1, len(self.chain)):
-            if not self.chain[i].verify() or self.chain[i].previous_hash != self.chain[i-1].block_hash:
+            block = self.chain[i]
+            valid = block.verify() if full else block.verify_pow()
+            if not valid or block.previous_hash != self.chain[i-1].block_hash:
                 print(f"[CHAIN] Verificação falhou no Bloco #{i}")
                 return False
         print("[CHAIN] ✓ Cadeia válida")
         return True
 
     def get_balance(self, address: str) -> float:
-        return sum(utxo.amount for utxo in self.utxo_set.values() if utxo.recipient_address == address)
+        return sum(utxo.amount for utxo in self._utxos_by_address.get(address, {}).values())
 
     def get_utxos_for_address(self, address: str) -> List[Tuple[str, int, TransactionOutput]]:
         return [
-            (utxo_key.split(':')[0], int(utxo_key.split(':')[1]), utxo)
-            for utxo_key, utxo in self.utxo_set.items()
-            if utxo.recipient_address == address
+            (tx_hash.hex(), index, utxo)
+            for (tx_hash, index), utxo in self._utxos_by_address.get(address, {}).items()
         ]
 
 # ============================================================================
@@ -0,0 +1,183 @@
+"""
+Kernels numéricos das demonstrações de crypto_breaker.
+
+O LCG tem dependência entre iterações (seed[i] depende de seed[i-1]) e o
+histograma do chi-quadrado é um laço escalar: com Numba ambos compilam para
+laços nativos. Sem Numba as mesmas funções rodam como Python puro.
+
+O SHA-256 e a tabela de endereçamento aberto do ataque de aniversário só
+compensam compilados: sem Numba, crypto_breaker continua com hashlib e set.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Decorador identidade usado quando o Numba não está instalado."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Constantes de rodada do SHA-256 (FIPS 180-4)
+_SHA256_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], np.int64)
+
+# Estado inicial H0..H7
+_SHA256_H = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], np.int64)
+
+_MASK32 = 0xFFFFFFFF
+
+
+@njit(cache=True, inline='always')
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK32
+
+
+@njit(cache=True)
+def sha256_prefixes(pool, hash_bytes):
+    """
+    Primeiros hash_bytes (<= 8) bytes do SHA-256 de cada input de 16 bytes
+    de pool, como uint64 big-endian (= int.from_bytes(digest[:hash_bytes]))
+
+    Um input de 16 bytes cabe num único bloco de 64 bytes com o padding, então
+    cada hash é uma só compressão. As palavras de 32 bits ficam em int64
+    mascarado (sem mistura de tipos com sinal e sem sinal no Numba).
+    """
+    n = pool.shape[0] // 16
+    shift = 64 - 8 * hash_bytes
+    out = np.empty(n, np.uint64)
+    w = np.zeros(64, np.int64)
+    for i in range(n):
+        base = 16 * i
+        for j in range(4):
+            o = base + 4 * j
+            w[j] = ((np.int64(pool[o]) << 24) | (np.int64(pool[o + 1]) << 16)
+                    | (np.int64(pool[o + 2]) << 8) | np.int64(pool[o + 3]))
+        # Padding: bit 1 após a mensagem, zeros e o tamanho em bits (128)
+        w[4] = 0x80000000
+        for j in range(5, 15):
+            w[j] = 0
+        w[15] = 128
+        for j in range(16, 64):
+            x = w[j - 15]
+            y = w[j - 2]
+            s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+            s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+            w[j] = (w[j - 16] + s0 + w[j - 7] + s1) & _MASK32
+
+        a = _SHA256_H[0]
+        b = _SHA256_H[1]
+        c = _SHA256_H[2]
+        d = _SHA256_H[3]
+        e = _SHA256_H[4]
+        f = _SHA256_H[5]
+        g = _SHA256_H[6]
+        h = _SHA256_H[7]
+        for j in range(64):
+            s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+            ch = (e & f) ^ ((~e & _MASK32) & g)
+            t1 = (h + s1 + ch + _SHA256_K[j] + w[j]) & _MASK32
+            s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+            maj = (a & b) ^ (a & c) ^ (b & c)
+            t2 = (s0 + maj) & _MASK32
+            h = g
+            g = f
+            f = e
+            e = (d + t1) & _MASK32
+            d = c
+            c = b
+            b = a
+            a = (t1 + t2) & _MASK32
+
+        h0 = (_SHA256_H[0] + a) & _MASK32
+        h1 = (_SHA256_H[1] + b) & _MASK32
+        out[i] = ((np.uint64(h0) << np.uint64(32)) | np.uint64(h1)) >> np.uint64(shift)
+    return out
+
+
+@njit(cache=True)
+def table_insert(keys, vals, prefixes, first_index, start):
+    """
+    Insere prefixes[start:] na tabela de endereçamento aberto (keys, vals)
+
+    vals guarda o índice global do input + 1 (0 = slot vazio); a sondagem é
+    linear a partir de key & (tamanho - 1). Para na primeira chave repetida e
+    retorna (posição em prefixes, índice do input anterior), ou (-1, -1).
+    """
+    mask = keys.shape[0] - 1
+    umask = np.uint64(mask)
+    for j in range(start, prefixes.shape[0]):
+        key = prefixes[j]
+        slot = np.int64(key & umask)
+        while vals[slot] != 0:
+            if keys[slot] == key:
+                return j, np.int64(vals[slot]) - 1
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        vals[slot] = first_index + j + 1
+    return -1, -1
+
+
+@njit(cache=True)
+def table_grow(keys, vals):
+    """Tabela com o dobro de slots e as mesmas entradas"""
+    size = 2 * keys.shape[0]
+    mask = size - 1
+    umask = np.uint64(mask)
+    new_keys = np.zeros(size, np.uint64)
+    new_vals = np.zeros(size, np.uint32)
+    for s in range(keys.shape[0]):
+        if vals[s] != 0:
+            slot = np.int64(keys[s] & umask)
+            while new_vals[slot] != 0:
+                slot = (slot + 1) & mask
+            new_keys[slot] = keys[s]
+            new_vals[slot] = vals[s]
+    return new_keys, new_vals
+
+
+@njit(cache=True)
+def lcg_samples(seed, n, modulus):
+    """
+    n saídas do LCG seed = (1103515245 * seed + 12345) mod 2^31, cada uma
+    reduzida mod `modulus`
+    """
+    out = np.empty(n, np.int64)
+    for i in range(n):
+        seed = (1103515245 * seed + 12345) & 0x7FFFFFFF
+        out[i] = seed % modulus
+    return out
+
+
+@njit(cache=True)
+def chi_squared(samples, num_bins):
+    """
+    Chi-quadrado das amostras distribuídas em num_bins faixas iguais de
+    [0, max]; a última faixa absorve o resto da divisão
+    """
+    bin_size = samples.max() // num_bins
+    observed = np.zeros(num_bins, np.int64)
+    for sample in samples:
+        observed[min(sample // bin_size, num_bins - 1)] += 1
+    
+    expected = samples.shape[0] / num_bins
+    total = 0.0
+    for obs in observed:
+        total += (obs - expected) ** 2 / expected
+    return total
@@ -20,12 +20,24 @@ Referências:
 
 import hashlib
 import hmac
+import os
+import queue
 import secrets
 import struct
-from typing import List, Tuple, Optional, Dict
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Tuple, Optional, Dict
 from dataclasses import dataclass
 from enum import Enum
 
+# ECDSA via libsecp256k1 (coincurve) quando disponível; senão, a implementação
+# pura em Python abaixo. BITCOIN_PURE_PYTHON=1 força o caminho em Python.
+try:
+    import coincurve
+    COINCURVE_AVAILABLE = os.getenv("BITCOIN_PURE_PYTHON", "0") in ("", "0")
+except ImportError:
+    COINCURVE_AVAILABLE = False
+
 
 class NetworkType(Enum):
     """Tipos de rede Bitcoin"""
@@ -56,8 +68,11 @@ def double_sha256(data: bytes) -> bytes:
     Double SHA-256: usado no Bitcoin para maior segurança
     
     H(x) = SHA256(SHA256(x))
+    
+    Chama hashlib (OpenSSL, com SHA-NI quando a CPU suporta) diretamente:
+    é o caminho quente do PoW e da Merkle Tree
     """
-    return sha256(sha256(data))
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
 
 
 def ripemd160(data: bytes) -> bytes:
@@ -96,6 +111,17 @@ def hash160(data: bytes) -> bytes:
     return ripemd160(sha256(data))
 
 
+def triple_digest(data: bytes) -> Tuple[bytes, bytes, bytes]:
+    """
+    SHA-256, Double SHA-256 e HASH160 do mesmo dado
+    
+    Os três começam com SHA256(x): calculado uma vez e reaproveitado
+    Retorna (sha256, double_sha256, hash160)
+    """
+    h1 = sha256(data)
+    return h1, sha256(h1), ripemd160(h1)
+
+
 # ============================================================================
 # PARTE 2: CURVA ELÍPTICA secp256k1
 # ============================================================================
@@ -132,17 +158,22 @@ class Secp256k1:
     h = 1
 
 
-@dataclass
-class Point:
-    """Ponto na curva elíptica"""
+# Constantes da curva como globais do módulo: nos caminhos quentes evitam o
+# lookup de atributo de classe a cada chamada
+_P = Secp256k1.p
+_N = Secp256k1.n
+_N_MINUS_1 = _N - 1
+_HALF_N = _N // 2
+
+class Point(NamedTuple):
+    """
+    Ponto na curva elíptica
+    
+    Tupla imutável: igualdade, hash e __slots__ vêm de tuple, em C
+    """
     x: int
     y: int
     
-    def __eq__(self, other):
-        if isinstance(other, Point):
-            return self.x == other.x and self.y == other.y
-        return False
-    
     def is_infinity(self) -> bool:
         """Verifica se é o ponto no infinito (identidade)"""
         return self.x is None and self.y is None
@@ -151,6 +182,9 @@ class Point:
 # Ponto no infinito (elemento identidade)
 POINT_AT_INFINITY = Point(None, None)
 
+# Ponto gerador G, construído uma única vez
+G = Point(Secp256k1.Gx, Secp256k1.Gy)
+
 
 def point_add(P: Point, Q: Point) -> Point:
     """
@@ -161,13 +195,13 @@ def point_add(P: Point, Q: Point) -> Point:
     2. P + (-P) = O
     3. P + Q: traça reta por P e Q, encontra terceiro ponto R, reflete em x
     """
-    # Caso especial: ponto no infinito
-    if P.is_infinity():
+    # Caso especial: ponto no infinito (x = None; comparação por identidade)
+    if P.x is None:
         return Q
-    if Q.is_infinity():
+    if Q.x is None:
         return P
     
-    p = Secp256k1.p
+    p = _P
     
     # Caso especial: P = -Q (mesma x, y oposto)
     if P.x == Q.x and (P.y + Q.y) % p == 0:
@@ -191,11 +225,60 @@ def point_add(P: Point, Q: Point) -> Point:
     return Point(x3, y3)
 
 
+# Coordenadas jacobianas: (X, Y, Z) representa o ponto afim (X/Z², Y/Z³).
+# Somas e duplicações usam só multiplicações mod p; a única inversão modular
+# acontece na conversão final para afim. Z = 0 é o ponto no infinito.
+_JACOBIAN_INFINITY = (1, 1, 0)
+
+
+def _jac_double(X1: int, Y1: int, Z1: int) -> Tuple[int, int, int]:
+    """2P em jacobianas (a = 0)"""
+    p = _P
+    if Z1 == 0 or Y1 == 0:
+        return _JACOBIAN_INFINITY
+    YY = Y1 * Y1 % p
+    S = 4 * X1 * YY % p
+    M = 3 * X1 * X1 % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y1 * Z1 % p
+    return X3, Y3, Z3
+
+
+def _jac_add_affine(X1: int, Y1: int, Z1: int, x2: int, y2: int) -> Tuple[int, int, int]:
+    """P (jacobiano) + Q (afim, Z = 1): soma mista, mais barata que a geral"""
+    p = _P
+    if Z1 == 0:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    H = (x2 * Z1Z1 - X1) % p
+    R = (y2 * Z1 * Z1Z1 - Y1) % p
+    if H == 0:
+        return _jac_double(X1, Y1, Z1) if R == 0 else _JACOBIAN_INFINITY
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return X3, Y3, Z3
+
+
+def _jac_to_affine(X: int, Y: int, Z: int) -> Point:
+    if Z == 0:
+        return POINT_AT_INFINITY
+    p = _P
+    z_inv = pow(Z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return Point(X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+
+
 def point_multiply(k: int, P: Point) -> Point:
     """
     Multiplicação escalar: k * P = P + P + ... + P (k vezes)
     
-    Usa algoritmo de "double-and-add" para eficiência O(log k)
+    Usa algoritmo de "double-and-add" para eficiência O(log k), em
+    coordenadas jacobianas (uma única inversão modular no final)
     
     Exemplo: 13 * P
     13 = 1101₂ = 8 + 4 + 1
@@ -206,18 +289,162 @@ def point_multiply(k: int, P: Point) -> Point:
     
     if k < 0:
         # -k * P = k * (-P)
-        return point_multiply(-k, Point(P.x, (-P.y) % Secp256k1.p))
+        return point_multiply(-k, Point(P.x, (-P.y) % _P))
+    
+    # Bits do mais para o menos significativo: duplica e, se bit = 1, soma P
+    x, y = P.x, P.y
+    X, Y, Z = _JACOBIAN_INFINITY
+    for bit in bin(k)[2:]:
+        X, Y, Z = _jac_double(X, Y, Z)
+        if bit == '1':
+            X, Y, Z = _jac_add_affine(X, Y, Z, x, y)
+    
+    return _jac_to_affine(X, Y, Z)
+
+
+# Base fixa G (comb de janela 4): linha i guarda j * 2^(4i) * G para j = 0..15,
+# em afim. k * G vira 64 somas mistas, sem nenhuma duplicação.
+_COMB_WIDTH = 4
+_G_TABLE: Optional[List[List[Optional[Tuple[int, int]]]]] = None
+
+
+def _g_table() -> List[List[Optional[Tuple[int, int]]]]:
+    """Tabela do comb, construída no primeiro uso (~960 pontos)"""
+    global _G_TABLE
+    if _G_TABLE is None:
+        table = []
+        base = G
+        for _ in range((Secp256k1.n.bit_length() + _COMB_WIDTH - 1) // _COMB_WIDTH):
+            row = [None, (base.x, base.y)]
+            acc = base
+            for _ in range(2, 1 << _COMB_WIDTH):
+                acc = point_add(acc, base)
+                row.append((acc.x, acc.y))
+            table.append(row)
+            base = point_add(acc, base)  # 2^w * base
+        _G_TABLE = table
+    return _G_TABLE
+
+
+def _generator_multiply(k: int) -> Point:
+    """k * G usando a tabela de base fixa"""
+    k %= _N
+    mask = (1 << _COMB_WIDTH) - 1
+    X, Y, Z = _JACOBIAN_INFINITY
+    for row in _g_table():
+        digit = k & mask
+        if digit:
+            X, Y, Z = _jac_add_affine(X, Y, Z, *row[digit])
+        k >>= _COMB_WIDTH
+    return _jac_to_affine(X, Y, Z)
+
+
+def _jac_batch_to_affine(points: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """
+    Converte vários pontos jacobianos (Z ≠ 0) para afim com uma só inversão
     
-    result = POINT_AT_INFINITY
-    addend = P
+    Truque de Montgomery: inverte o produto de todos os Z e recupera cada
+    Z⁻¹ com multiplicações pelos produtos parciais
+    """
+    p = _P
+    prefix = []
+    acc = 1
+    for _, _, Z in points:
+        prefix.append(acc)
+        acc = acc * Z % p
+    inv = pow(acc, -1, p)
+    affine = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[i]
+        z_inv = inv * prefix[i] % p
+        inv = inv * Z % p
+        z_inv2 = z_inv * z_inv % p
+        affine[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    return affine
+
+
+def _odd_multiples(P: Point, width: int) -> List[Tuple[int, int]]:
+    """[P, 3P, 5P, ..., (2^(width-1) - 1)P] em afim"""
+    D = point_add(P, P)
+    points = [(P.x, P.y, 1)]
+    for _ in range((1 << (width - 2)) - 1):
+        points.append(_jac_add_affine(*points[-1], D.x, D.y))
+    return _jac_batch_to_affine(points)
+
+
+def _wnaf(k: int, width: int) -> List[int]:
+    """
+    Forma não-adjacente com janela (wNAF) de k, do bit menos significativo
     
+    Dígitos são 0 ou ímpares em (-2^(width-1), 2^(width-1)); entre dois
+    dígitos não nulos há pelo menos width-1 zeros
+    """
+    digits = []
+    full = 1 << width
+    half = full >> 1
     while k:
-        if k & 1:  # Se bit menos significativo é 1
-            result = point_add(result, addend)
-        addend = point_add(addend, addend)  # Duplica
-        k >>= 1  # Shift right
+        if k & 1:
+            digit = k & (full - 1)
+            if digit >= half:
+                digit -= full
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        k >>= 1
+    return digits
+
+
+# Janelas do wNAF em point_multiply_shamir: G usa uma tabela fixa maior
+# (64 pontos, construída uma vez); pontos arbitrários pagam a tabela a cada
+# chamada, então ficam com 8 pontos
+_SHAMIR_G_WIDTH = 8
+_SHAMIR_WIDTH = 5
+_G_ODD_TABLE: Optional[List[Tuple[int, int]]] = None
+
+
+def _g_odd_table() -> List[Tuple[int, int]]:
+    global _G_ODD_TABLE
+    if _G_ODD_TABLE is None:
+        _G_ODD_TABLE = _odd_multiples(G, _SHAMIR_G_WIDTH)
+    return _G_ODD_TABLE
+
+
+def point_multiply_shamir(k1: int, P1: Point, k2: int, P2: Point) -> Point:
+    """
+    k₁ * P₁ + k₂ * P₂ numa única passada (truque de Shamir/Straus)
     
-    return result
+    Os dois escalares em wNAF compartilham as mesmas duplicações; as tabelas
+    de múltiplos ímpares são normalizadas para afim com uma inversão
+    (Montgomery) e o resultado jacobiano só é invertido no final
+    """
+    p = _P
+    terms = []
+    for k, P in ((k1, P1), (k2, P2)):
+        k %= _N
+        if k == 0 or P.is_infinity():
+            continue
+        if P is G:
+            terms.append((_wnaf(k, _SHAMIR_G_WIDTH), _g_odd_table()))
+        else:
+            terms.append((_wnaf(k, _SHAMIR_WIDTH), _odd_multiples(P, _SHAMIR_WIDTH)))
+    if not terms:
+        return POINT_AT_INFINITY
+    
+    X, Y, Z = _JACOBIAN_INFINITY
+    for i in range(max(len(digits) for digits, _ in terms) - 1, -1, -1):
+        X, Y, Z = _jac_double(X, Y, Z)
+        for digits, table in terms:
+            if i < len(digits) and digits[i]:
+                digit = digits[i]
+                x, y = table[abs(digit) >> 1]
+                X, Y, Z = _jac_add_affine(X, Y, Z, x, y if digit > 0 else p - y)
+    
+    return _jac_to_affine(X, Y, Z)
+
+
+# Expoente da raiz quadrada módulo p (p ≡ 3 mod 4)
+_SQRT_EXPONENT = (_P + 1) // 4
 
 
 def point_compress(P: Point) -> bytes:
@@ -230,8 +457,7 @@ def point_compress(P: Point) -> bytes:
     if P.is_infinity():
         return b'\x00'
     
-    prefix = 0x02 if P.y % 2 == 0 else 0x03
-    return bytes([prefix]) + P.x.to_bytes(32, 'big')
+    return (b'\x03' if P.y & 1 else b'\x02') + P.x.to_bytes(32, 'big')
 
 
 def point_decompress(compressed: bytes) -> Point:
@@ -246,15 +472,19 @@ def point_decompress(compressed: bytes) -> Point:
     prefix = compressed[0]
     x = int.from_bytes(compressed[1:], 'big')
     
+    p = _P
+    
     # Calcula y² = x³ + 7 (mod p)
-    y_squared = (pow(x, 3, Secp256k1.p) + Secp256k1.b) % Secp256k1.p
+    y_squared = (x * x * x + Secp256k1.b) % p
     
-    # Calcula raiz quadrada módulo p (usando Tonelli-Shanks)
-    y = pow(y_squared, (Secp256k1.p + 1) // 4, Secp256k1.p)
+    # Raiz quadrada módulo p: como p ≡ 3 (mod 4), y = (y²)^((p+1)/4)
+    y = pow(y_squared, _SQRT_EXPONENT, p)
+    if y * y % p != y_squared:
+        raise ValueError("x is not on the curve")
     
     # Escolhe y com paridade correta
-    if (y % 2 == 0) != (prefix == 0x02):
-        y = Secp256k1.p - y
+    if (y & 1) != (prefix == 0x03):
+        y = p - y
     
     return Point(x, y)
 
@@ -294,7 +524,7 @@ def generate_private_key() -> int:
     Chave privada: número inteiro aleatório no intervalo [1, n-1]
     onde n é a ordem do grupo
     """
-    return secrets.randbelow(Secp256k1.n - 1) + 1
+    return secrets.randbelow(_N_MINUS_1) + 1
 
 
 def private_key_to_public_key(private_key: int) -> Point:
@@ -304,8 +534,56 @@ def private_key_to_public_key(private_key: int) -> Point:
     Chave pública = private_key * G
     onde G é o ponto gerador da curva
     """
-    G = Point(Secp256k1.Gx, Secp256k1.Gy)
-    return point_multiply(private_key, G)
+    if COINCURVE_AVAILABLE:
+        return Point(*coincurve.PrivateKey.from_int(private_key).public_key.point())
+    return _generator_multiply(private_key)
+
+
+# Pool opcional de nonces pré-calculados (k, k⁻¹ mod n, k * G), preenchido
+# por uma thread daemon; só usado no caminho em Python puro. Desligado por
+# padrão; BITCOIN_NONCE_POOL=<tamanho> liga. Cada entrada sai da fila uma
+# única vez, e um processo filho (fork) descarta a cópia herdada: reusar k
+# entre assinaturas vaza a chave privada.
+_NONCE_POOL_SIZE = int(os.getenv("BITCOIN_NONCE_POOL", "0"))
+_nonce_pool: Optional[queue.Queue] = None
+_nonce_pool_lock = threading.Lock()
+
+
+def _fresh_nonce() -> Tuple[int, int, Point]:
+    """Sorteia k e calcula (k, k⁻¹ mod n, k * G)"""
+    k = secrets.randbelow(_N_MINUS_1) + 1
+    return k, pow(k, -1, _N), _generator_multiply(k)
+
+
+def _fill_nonce_pool(pool: queue.Queue):
+    while True:
+        pool.put(_fresh_nonce())  # bloqueia enquanto a fila está cheia
+
+
+def _next_nonce() -> Tuple[int, int, Point]:
+    """Próximo nonce do pool; calcula na hora se o pool está desligado ou vazio"""
+    global _nonce_pool
+    if _NONCE_POOL_SIZE <= 0:
+        return _fresh_nonce()
+    with _nonce_pool_lock:
+        if _nonce_pool is None:
+            _nonce_pool = queue.Queue(maxsize=_NONCE_POOL_SIZE)
+            threading.Thread(target=_fill_nonce_pool, args=(_nonce_pool,),
+                             daemon=True).start()
+        pool = _nonce_pool
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return _fresh_nonce()
+
+
+def _reset_nonce_pool():
+    global _nonce_pool, _nonce_pool_lock
+    _nonce_pool = None
+    _nonce_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_nonce_pool)
 
 
 def sign_message(message: bytes, private_key: int) -> Signature:
@@ -320,30 +598,35 @@ def sign_message(message: bytes, private_key: int) -> Signature:
     5. s = k⁻¹(e + r * private_key) mod n
     6. Retorna (r, s)
     """
-    # Hash da mensagem
-    e = int.from_bytes(double_sha256(message), 'big')
-    
-    # Gera nonce k (CRÍTICO: deve ser aleatório e único para cada assinatura!)
-    k = secrets.randbelow(Secp256k1.n - 1) + 1
-    
-    # Calcula k * G
-    G = Point(Secp256k1.Gx, Secp256k1.Gy)
-    R = point_multiply(k, G)
+    if COINCURVE_AVAILABLE:
+        # libsecp256k1: nonce determinístico (RFC 6979) e s baixo
+        compact = coincurve.PrivateKey.from_int(private_key).sign_recoverable(
+            message, hasher=double_sha256)
+        return Signature(int.from_bytes(compact[:32], 'big'), int.from_bytes(compact[32:64], 'big'))
     
-    # r = x_R mod n
-    r = R.x % Secp256k1.n
-    if r == 0:
-        # Caso raro: tenta novamente
-        return sign_message(message, private_key)
+    n = _N
     
-    # s = k⁻¹(e + r * d) mod n
-    k_inv = pow(k, -1, Secp256k1.n)
-    s = (k_inv * (e + r * private_key)) % Secp256k1.n
-    if s == 0:
-        # Caso raro: tenta novamente
-        return sign_message(message, private_key)
+    # Hash da mensagem (calculado uma vez, mesmo se houver nova tentativa)
+    e = int.from_bytes(double_sha256(message), 'big')
     
-    return Signature(r, s)
+    while True:
+        # Nonce k com k⁻¹ e R = k * G
+        # (CRÍTICO: deve ser aleatório e único para cada assinatura!)
+        k, k_inv, R = _next_nonce()
+        
+        # r = x_R mod n
+        r = R.x % n
+        if r == 0:
+            # Caso raro: tenta novamente com outro k
+            continue
+        
+        # s = k⁻¹(e + r * d) mod n
+        s = (k_inv * (e + r * private_key)) % n
+        if s == 0:
+            # Caso raro: tenta novamente com outro k
+            continue
+        
+        return Signature(r, s)
 
 
 def verify_signature(message: bytes, signature: Signature, public_key: Point) -> bool:
@@ -362,32 +645,45 @@ def verify_signature(message: bytes, signature: Signature, public_key: Point) ->
     r, s = signature.r, signature.s
     
     # Verifica range
-    if not (1 <= r < Secp256k1.n and 1 <= s < Secp256k1.n):
+    n = _N
+    if not (1 <= r < n and 1 <= s < n):
         return False
     
+    if COINCURVE_AVAILABLE:
+        # O ponto no infinito não tem codificação SEC; nunca é chave válida
+        if public_key.is_infinity():
+            return False
+        # libsecp256k1 só aceita s "baixo"; (r, n - s) é a mesma assinatura ECDSA
+        if s > _HALF_N:
+            s = n - s
+        try:
+            key = coincurve.PublicKey(
+                b'\x04' + public_key.x.to_bytes(32, 'big') + public_key.y.to_bytes(32, 'big')
+            )
+            return key.verify(Signature(r, s).to_der(), message, hasher=double_sha256)
+        except (ValueError, OverflowError, TypeError):
+            return False
+    
     # Hash da mensagem
     e = int.from_bytes(double_sha256(message), 'big')
     
     # w = s⁻¹ mod n
-    w = pow(s, -1, Secp256k1.n)
+    w = pow(s, -1, n)
     
     # u₁ = e * w mod n
-    u1 = (e * w) % Secp256k1.n
+    u1 = (e * w) % n
     
     # u₂ = r * w mod n
-    u2 = (r * w) % Secp256k1.n
+    u2 = (r * w) % n
     
     # (x, y) = u₁ * G + u₂ * Q
-    G = Point(Secp256k1.Gx, Secp256k1.Gy)
-    point1 = point_multiply(u1, G)
-    point2 = point_multiply(u2, public_key)
-    result = point_add(point1, point2)
+    result = point_multiply_shamir(u1, G, u2, public_key)
     
     if result.is_infinity():
         return False
     
     # Verifica r ≡ x (mod n)
-    return r == result.x % Secp256k1.n
+    return r == result.x % n
 
 
 # ============================================================================
@@ -396,6 +692,17 @@ def verify_signature(message: bytes, signature: Signature, public_key: Point) ->
 
 BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 
+_B58_DIGITS = BASE58_ALPHABET.encode('ascii')
+# Valor de cada byte ASCII no alfabeto (-1 = caractere inválido)
+_B58_INDEX = [-1] * 256
+for _i, _c in enumerate(_B58_DIGITS):
+    _B58_INDEX[_c] = _i
+del _i, _c
+
+# base58_decode acumula 10 dígitos num inteiro pequeno (58^10 < 2^59) antes
+# de tocar o bignum
+_B58_CHUNK = 10
+
 
 def base58_encode(data: bytes) -> str:
     """
@@ -406,39 +713,40 @@ def base58_encode(data: bytes) -> str:
     # Converte para inteiro
     num = int.from_bytes(data, 'big')
     
-    # Converte para base58
-    encoded = ''
+    # Converte para base58 (dígitos do menos significativo para o mais)
+    digits = _B58_DIGITS
+    out = bytearray()
     while num > 0:
         num, remainder = divmod(num, 58)
-        encoded = BASE58_ALPHABET[remainder] + encoded
+        out.append(digits[remainder])
     
     # Preserva zeros iniciais
-    for byte in data:
-        if byte == 0:
-            encoded = '1' + encoded
-        else:
-            break
+    out.extend(b'1' * (len(data) - len(data.lstrip(b'\x00'))))
     
-    return encoded
+    out.reverse()
+    return out.decode('ascii')
 
 
 def base58_decode(encoded: str) -> bytes:
     """Decodifica string Base58 para bytes"""
+    raw = encoded.encode('ascii', 'replace')
+    index = _B58_INDEX
     num = 0
-    for char in encoded:
-        num = num * 58 + BASE58_ALPHABET.index(char)
+    for start in range(0, len(raw), _B58_CHUNK):
+        block = raw[start:start + _B58_CHUNK]
+        chunk = 0
+        for byte in block:
+            value = index[byte]
+            if value < 0:
+                raise ValueError(f"Invalid Base58 character: {chr(byte)!r}")
+            chunk = chunk * 58 + value
+        num = num * 58 ** len(block) + chunk
     
     # Converte para bytes
     data = num.to_bytes((num.bit_length() + 7) // 8, 'big')
     
     # Restaura zeros iniciais
-    for char in encoded:
-        if char == '1':
-            data = b'\x00' + data
-        else:
-            break
-    
-    return data
+    return b'\x00' * (len(raw) - len(raw.lstrip(b'1'))) + data
 
 
 def base58check_encode(payload: bytes, version: int = 0x00) -> str:
@@ -465,18 +773,20 @@ def base58check_decode(encoded: str) -> Tuple[int, bytes]:
     Retorna (version, payload)
     """
     data = base58_decode(encoded)
+    if len(data) < 5:
+        raise ValueError("Base58Check data too short")
     
-    # Separa componentes
-    version = data[0]
-    payload = data[1:-4]
+    # Separa componentes (o corpo é hasheado via memoryview, sem cópia)
+    body = memoryview(data)[:-4]
     checksum = data[-4:]
     
-    # Verifica checksum
-    expected_checksum = double_sha256(data[:-4])[:4]
-    if checksum != expected_checksum:
+    # Verifica checksum em tempo constante
+    sha = hashlib.sha256
+    expected_checksum = sha(sha(body).digest()).digest()[:4]
+    if not hmac.compare_digest(checksum, expected_checksum):
         raise ValueError("Invalid checksum")
     
-    return version, payload
+    return data[0], data[1:-4]
 
 
 # ============================================================================
@@ -531,6 +841,47 @@ def private_key_to_wif(private_key: int, compressed: bool = True,
 # PARTE 6: MERKLE TREES
 # ============================================================================
 
+def merkle_parents(level: bytes) -> bytes:
+    """
+    Nível pai de uma árvore de Merkle
+    
+    Os níveis são buffers planos: hashes de 32 bytes concatenados. Todo hash
+    interno é double-SHA256 de exatamente 64 bytes, lidos como fatias de
+    memoryview (sem cópia); este é o único ponto que processa esse lote,
+    para MerkleTree e para a raiz dos blocos em blockchain/.
+    
+    Com número ímpar de nós, o último é pareado consigo mesmo (como no
+    Bitcoin) sem copiar o nível para duplicá-lo.
+    """
+    sha = hashlib.sha256
+    view = memoryview(level)
+    paired = len(level) - len(level) % 64
+    parents = [sha(sha(view[i:i + 64]).digest()).digest()
+               for i in range(0, paired, 64)]
+    if paired < len(level):
+        last = level[paired:]
+        parents.append(sha(sha(last + last).digest()).digest())
+    return b''.join(parents)
+
+
+def _merkle_leaves(hashes: List[bytes]) -> bytes:
+    """Folhas como um buffer plano de hashes de 32 bytes"""
+    if not hashes:
+        raise ValueError("Transactions list cannot be empty")
+    level = b''.join(hashes)
+    if len(level) != 32 * len(hashes):
+        raise ValueError("Transaction hashes must be 32 bytes")
+    return level
+
+
+def merkle_root(hashes: List[bytes]) -> bytes:
+    """Raiz de Merkle sem guardar os níveis intermediários"""
+    level = _merkle_leaves(hashes)
+    while len(level) > 32:
+        level = merkle_parents(level)
+    return level
+
+
 class MerkleTree:
     """
     Árvore de Merkle para verificação eficiente de transações
@@ -552,25 +903,23 @@ class MerkleTree:
             raise ValueError("Transactions list cannot be empty")
         
         self.transactions = transactions
-        self.root = self._build_tree(transactions)
+        self.levels = self._build_levels(transactions)
+        self.root = self.levels[-1]
     
-    def _build_tree(self, hashes: List[bytes]) -> bytes:
-        """Constrói árvore recursivamente"""
-        if len(hashes) == 1:
-            return hashes[0]
-        
-        # Se número ímpar, duplica último
-        if len(hashes) % 2 == 1:
-            hashes.append(hashes[-1])
-        
-        # Combina pares
-        parent_hashes = []
-        for i in range(0, len(hashes), 2):
-            combined = hashes[i] + hashes[i + 1]
-            parent_hash = double_sha256(combined)
-            parent_hashes.append(parent_hash)
+    def _build_levels(self, hashes: List[bytes]) -> List[bytes]:
+        """
+        Constrói a árvore nível a nível, das folhas até a raiz
         
-        return self._build_tree(parent_hashes)
+        Os níveis ficam guardados para que get_proof não recalcule a árvore,
+        cada um como um buffer plano (32 bytes por nó) em vez de uma lista de
+        objetos bytes.
+        """
+        level = _merkle_leaves(hashes)
+        levels = [level]
+        while len(level) > 32:
+            level = merkle_parents(level)
+            levels.append(level)
+        return levels
     
     def get_root(self) -> bytes:
         """Retorna raiz da árvore"""
@@ -586,27 +935,15 @@ class MerkleTree:
         if index < 0 or index >= len(self.transactions):
             raise ValueError("Invalid transaction index")
         
+        # Irmão no nível L é index ^ 1 (o próprio nó, se for o último de um
+        # nível ímpar); sobe um nível com index >> 1
         proof = []
-        hashes = self.transactions[:]
-        
-        while len(hashes) > 1:
-            if len(hashes) % 2 == 1:
-                hashes.append(hashes[-1])
-            
-            # Encontra par
-            pair_index = index + 1 if index % 2 == 0 else index - 1
-            is_right = index % 2 == 0
-            
-            proof.append((hashes[pair_index], is_right))
-            
-            # Sobe um nível
-            index = index // 2
-            parent_hashes = []
-            for i in range(0, len(hashes), 2):
-                combined = hashes[i] + hashes[i + 1]
-                parent_hash = double_sha256(combined)
-                parent_hashes.append(parent_hash)
-            hashes = parent_hashes
+        for level in self.levels[:-1]:
+            sibling = (index ^ 1) * 32
+            if sibling >= len(level):
+                sibling = index * 32
+            proof.append((level[sibling:sibling + 32], index % 2 == 0))
+            index >>= 1
         
         return proof
     
@@ -641,43 +978,95 @@ class MerkleTree:
 # PARTE 7: PROOF OF WORK
 # ============================================================================
 
-def proof_of_work(data: bytes, difficulty: int) -> Tuple[int, bytes]:
+_POW_NONCE = struct.Struct('>Q')
+
+# Limite de segurança para testes
+_POW_MAX_ATTEMPTS = 10_000_001
+
+# Tamanho da faixa de nonces por tarefa na busca paralela
+_POW_CHUNK = 1 << 18
+
+
+def _pow_max_hash(difficulty: int) -> bytes:
+    """
+    Maior hash aceito, em bytes big-endian: HASH < 2^(256 - difficulty)
+    
+    Digests de 32 bytes comparados como bytes (memcmp) seguem a mesma ordem
+    dos inteiros big-endian, sem criar um int de 256 bits por tentativa.
+    """
+    return ((1 << (256 - difficulty)) - 1).to_bytes(32, 'big')
+
+
+def _pow_scan(data: bytes, difficulty: int, start: int, stop: int) -> Optional[Tuple[int, bytes]]:
+    """Procura em [start, stop) o primeiro nonce que satisfaz a dificuldade"""
+    max_hash = _pow_max_hash(difficulty)
+    
+    # Midstate: `data` é comprimido uma vez; por nonce só copia o estado
+    # e processa os 8 bytes do nonce
+    sha = hashlib.sha256
+    prefix_ctx = sha(data)
+    pack_nonce = _POW_NONCE.pack
+    
+    for nonce in range(start, stop):
+        h = prefix_ctx.copy()
+        h.update(pack_nonce(nonce))
+        block_hash = sha(h.digest()).digest()
+        if block_hash <= max_hash:
+            return nonce, block_hash
+    return None
+
+
+def _parallel_pow(data: bytes, difficulty: int, workers: int) -> Optional[Tuple[int, bytes]]:
+    """
+    Divide os nonces em faixas entre processos
+    
+    Os resultados são consumidos em ordem: o nonce devolvido é o mesmo
+    da busca serial.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = []
+        next_start = 0
+        while next_start < _POW_MAX_ATTEMPTS or pending:
+            while len(pending) < 2 * workers and next_start < _POW_MAX_ATTEMPTS:
+                stop = min(next_start + _POW_CHUNK, _POW_MAX_ATTEMPTS)
+                pending.append(pool.submit(_pow_scan, data, difficulty, next_start, stop))
+                next_start = stop
+            
+            result = pending.pop(0).result()
+            if result is not None:
+                return result
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def proof_of_work(data: bytes, difficulty: int, workers: int = 1) -> Tuple[int, bytes]:
     """
     Proof of Work: encontra nonce tal que HASH(data + nonce) < target
     
     Args:
         data: Dados do bloco
         difficulty: Número de zeros iniciais no hash (em bits)
+        workers: Processos para a busca (1 = serial, no processo atual)
     
     Returns:
         (nonce, hash)
     """
-    target = 2 ** (256 - difficulty)
-    nonce = 0
+    if workers > 1:
+        result = _parallel_pow(data, difficulty, workers)
+    else:
+        result = _pow_scan(data, difficulty, 0, _POW_MAX_ATTEMPTS)
     
-    while True:
-        block_data = data + nonce.to_bytes(8, 'big')
-        block_hash = double_sha256(block_data)
-        hash_int = int.from_bytes(block_hash, 'big')
-        
-        if hash_int < target:
-            return nonce, block_hash
-        
-        nonce += 1
-        
-        # Limite de segurança para testes
-        if nonce > 10_000_000:
-            raise RuntimeError("PoW failed: difficulty too high")
+    if result is None:
+        raise RuntimeError("PoW failed: difficulty too high")
+    return result
 
 
 def verify_proof_of_work(data: bytes, nonce: int, difficulty: int) -> bool:
     """Verifica Proof of Work"""
-    target = 2 ** (256 - difficulty)
-    block_data = data + nonce.to_bytes(8, 'big')
-    block_hash = double_sha256(block_data)
-    hash_int = int.from_bytes(block_hash, 'big')
-    
-    return hash_int < target
+    block_hash = double_sha256(data + _POW_NONCE.pack(nonce))
+    return block_hash <= _pow_max_hash(difficulty)
 
 
 # ============================================================================
@@ -19,17 +19,25 @@ AVISO: Este código é apenas para fins educacionais e de pesquisa!
 
 import time
 import hashlib
+import hmac
 import secrets
 import multiprocessing as mp
 from typing import Optional, Dict, List, Tuple
 from collections import defaultdict
 import itertools
+from operator import itemgetter, methodcaller
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+
+from _breaker_kernels import (
+    NUMBA_AVAILABLE, chi_squared, lcg_samples, sha256_prefixes, table_grow, table_insert,
+)
 from bitcoin_crypto import (
     sha256, double_sha256, hash160,
     generate_private_key, private_key_to_public_key,
     sign_message, verify_signature,
-    Secp256k1, Point, Signature
+    Secp256k1, Signature, G
 )
 
 
@@ -37,6 +45,90 @@ from bitcoin_crypto import (
 # ATAQUE 1: BRUTE FORCE (SHA-256)
 # ============================================================================
 
+# Candidatos por bloco de trabalho da força bruta
+_BRUTE_CHUNK = 1 << 16
+
+
+def _preimage_chunks(symbols: List[bytes], max_length: int):
+    """
+    Divide o espaço de busca em blocos (prefixo fixo + sufixo livre)
+    
+    Percorre os comprimentos 1..max_length e, dentro de cada um, os prefixos
+    na ordem de itertools.product: concatenar os blocos reproduz a ordem da
+    busca serial. Gera (prefixo, comprimento do sufixo, candidatos no bloco).
+    """
+    base = len(symbols)
+    for length in range(1, max_length + 1):
+        suffix_length = length
+        while suffix_length > 0 and base ** suffix_length > _BRUTE_CHUNK:
+            suffix_length -= 1
+        size = base ** suffix_length
+        for combo in itertools.product(symbols, repeat=length - suffix_length):
+            yield b''.join(combo), suffix_length, size
+
+
+def _brute_chunk(prefix: bytes, symbols: List[bytes], suffix_length: int,
+                 target_prefix: bytes, limit: int) -> Tuple[Optional[bytes], int]:
+    """
+    Testa até `limit` candidatos prefixo + sufixo
+    
+    Retorna (pré-imagem ou None, tentativas feitas). Função de módulo para
+    poder rodar em outro processo.
+    
+    Com charset de 1 byte por símbolo o candidato é um bytearray reescrito
+    no lugar (odômetro): o último caractere gira num laço sobre os bytes do
+    charset e só as posições anteriores passam por itertools.product, uma
+    tupla a cada len(charset) tentativas em vez de tupla + str + bytes por
+    tentativa.
+    """
+    sha = hashlib.sha256
+    n = len(target_prefix)
+    tries = 0
+    
+    if suffix_length == 0 or any(len(symbol) != 1 for symbol in symbols):
+        for combo in itertools.product(symbols, repeat=suffix_length):
+            if tries >= limit:
+                break
+            candidate = prefix + b''.join(combo)
+            tries += 1
+            if sha(candidate).digest()[:n] == target_prefix:
+                return candidate, tries
+        return None, tries
+    
+    digits = b''.join(symbols)
+    last = len(prefix) + suffix_length - 1
+    for head in itertools.product(symbols, repeat=suffix_length - 1):
+        candidate = bytearray(prefix + b''.join(head) + digits[:1])
+        for digit in digits:
+            if tries >= limit:
+                return None, tries
+            candidate[last] = digit
+            tries += 1
+            if sha(candidate).digest()[:n] == target_prefix:
+                return bytes(candidate), tries
+    return None, tries
+
+
+def _parallel_brute(jobs, workers: int):
+    """
+    Executa os blocos em processos, devolvendo os resultados em ordem
+    
+    Mantém no máximo 2 * workers blocos em voo; ao sair (pré-imagem
+    encontrada ou limite atingido) cancela o que ainda não começou.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = []
+        for job in jobs:
+            pending.append(pool.submit(_brute_chunk, *job))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        while pending:
+            yield pending.pop(0).result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 class BruteForceAttack:
     """
     Ataque de força bruta em hash SHA-256
@@ -50,7 +142,7 @@ class BruteForceAttack:
     @staticmethod
     def find_preimage(target_hash: bytes, max_attempts: int = 1_000_000,
                      charset: str = "abcdefghijklmnopqrstuvwxyz0123456789",
-                     max_length: int = 6) -> Optional[bytes]:
+                     max_length: int = 6, workers: int = 1) -> Optional[bytes]:
         """
         Tenta encontrar pré-imagem de um hash
         
@@ -59,41 +151,52 @@ class BruteForceAttack:
             max_attempts: Número máximo de tentativas
             charset: Conjunto de caracteres para testar
             max_length: Comprimento máximo da string
+            workers: Processos para a busca (1 = serial, no processo atual)
         
         Returns:
             Pré-imagem se encontrada, None caso contrário
         """
         target_prefix = target_hash[:4]  # Primeiros 4 bytes
+        symbols = [c.encode() for c in charset]
         attempts = 0
         
         print(f"[BRUTE FORCE] Procurando pré-imagem para {target_prefix.hex()}...")
         start_time = time.time()
         
-        # Testa todas as combinações até max_length
-        for length in range(1, max_length + 1):
-            for combo in itertools.product(charset, repeat=length):
-                if attempts >= max_attempts:
-                    print(f"[BRUTE FORCE] Máximo de tentativas atingido: {attempts}")
-                    return None
-                
-                candidate = ''.join(combo).encode()
-                candidate_hash = sha256(candidate)
-                
-                attempts += 1
-                
-                if attempts % 10000 == 0:
-                    elapsed = time.time() - start_time
-                    rate = attempts / elapsed
-                    print(f"  Tentativas: {attempts:,} | Taxa: {rate:,.0f} hash/s")
-                
-                if candidate_hash[:4] == target_prefix:
-                    elapsed = time.time() - start_time
-                    print(f"[BRUTE FORCE] ✓ Pré-imagem encontrada!")
-                    print(f"  Input: {candidate.decode()}")
-                    print(f"  Hash: {candidate_hash.hex()}")
-                    print(f"  Tentativas: {attempts:,}")
-                    print(f"  Tempo: {elapsed:.2f}s")
-                    return candidate
+        # Blocos na mesma ordem de itertools.product, cada um limitado ao
+        # que resta de max_attempts
+        def jobs():
+            submitted = 0
+            for prefix, suffix_length, size in _preimage_chunks(symbols, max_length):
+                if submitted >= max_attempts:
+                    return
+                limit = min(size, max_attempts - submitted)
+                submitted += limit
+                yield prefix, symbols, suffix_length, target_prefix, limit
+        
+        if workers > 1:
+            results = _parallel_brute(jobs(), workers)
+        else:
+            results = (_brute_chunk(*job) for job in jobs())
+        
+        for candidate, tries in results:
+            attempts += tries
+            elapsed = time.time() - start_time
+            
+            if candidate is not None:
+                print(f"[BRUTE FORCE] ✓ Pré-imagem encontrada!")
+                print(f"  Input: {candidate.decode()}")
+                print(f"  Hash: {sha256(candidate).hex()}")
+                print(f"  Tentativas: {attempts:,}")
+                print(f"  Tempo: {elapsed:.2f}s")
+                return candidate
+            
+            rate = attempts / elapsed if elapsed > 0 else 0.0
+            print(f"  Tentativas: {attempts:,} | Taxa: {rate:,.0f} hash/s")
+            
+            if attempts >= max_attempts:
+                print(f"[BRUTE FORCE] Máximo de tentativas atingido: {attempts}")
+                return None
         
         return None
     
@@ -133,6 +236,13 @@ class BruteForceAttack:
 # ATAQUE 2: BIRTHDAY ATTACK (Colisões)
 # ============================================================================
 
+# Inputs gerados e hasheados por bloco em BirthdayAttack.find_collision
+_BIRTHDAY_BATCH = 4096
+
+# Slots iniciais da tabela de endereçamento aberto (dobra a 50% de carga)
+_BIRTHDAY_TABLE_SLOTS = 1 << 17
+
+
 class BirthdayAttack:
     """
     Ataque de aniversário para encontrar colisões de hash
@@ -144,6 +254,48 @@ class BirthdayAttack:
     SHA-256 (256 bits): ~2^128 tentativas (ainda impraticável)
     """
     
+    @staticmethod
+    def _hash_keys(pool: bytes, inputs: List[bytes], hash_bytes: int):
+        """Hash truncado (como int big-endian) de cada input do bloco, em lote"""
+        # Com Numba o bloco inteiro é hasheado num laço nativo, desde que o
+        # corte caiba num uint64
+        if NUMBA_AVAILABLE and 1 <= hash_bytes <= 8:
+            return sha256_prefixes(np.frombuffer(pool, np.uint8), hash_bytes).tolist()
+        # Senão, map() encadeia hashlib.sha256, .digest(), o corte e
+        # int.from_bytes em C, sem chamada Python por hash
+        digest = methodcaller('digest')
+        truncate = itemgetter(slice(0, hash_bytes))
+        return map(int.from_bytes, map(truncate, map(digest, map(hashlib.sha256, inputs))))
+    
+    @staticmethod
+    def _find_original(pools: List[bytes], key: int, hash_bytes: int,
+                       input_data: bytes) -> Optional[bytes]:
+        """Recupera, dos blocos já sorteados, o input anterior com este hash"""
+        for pool in pools:
+            inputs = [pool[j:j + 16] for j in range(0, len(pool), 16)]
+            for candidate, candidate_key in zip(inputs, BirthdayAttack._hash_keys(pool, inputs, hash_bytes)):
+                if candidate_key == key and candidate != input_data:
+                    return candidate
+        return None
+    
+    @staticmethod
+    def _report_collision(original_input: bytes, input_data: bytes, key: int,
+                          hash_bytes: int, attempts: int, start_time: float) -> Tuple[bytes, bytes]:
+        elapsed = time.time() - start_time
+        print(f"[BIRTHDAY ATTACK] ✓ Colisão encontrada!")
+        print(f"  Input 1: {original_input.hex()}")
+        print(f"  Input 2: {input_data.hex()}")
+        print(f"  Hash: {key.to_bytes(hash_bytes, 'big').hex()}")
+        print(f"  Tentativas: {attempts:,}")
+        print(f"  Tempo: {elapsed:.2f}s")
+        return (original_input, input_data)
+    
+    @staticmethod
+    def _report_progress(i: int, start_time: float):
+        elapsed = time.time() - start_time
+        rate = i / elapsed
+        print(f"  Tentativas: {i:,} | Taxa: {rate:,.0f} hash/s")
+    
     @staticmethod
     def find_collision(bits: int = 32, max_attempts: int = 1_000_000) -> Optional[Tuple[bytes, bytes]]:
         """
@@ -159,38 +311,95 @@ class BirthdayAttack:
         print(f"[BIRTHDAY ATTACK] Procurando colisão em {bits} bits...")
         print(f"  Colisões esperadas após ~2^{bits//2} = {2**(bits//2):,} tentativas")
         
-        hash_table: Dict[bytes, bytes] = {}
+        hash_bytes = bits // 8
+        # A tabela nativa guarda chaves uint64 e índices uint32 (+1)
+        if NUMBA_AVAILABLE and 1 <= hash_bytes <= 8 and max_attempts < 0xFFFFFFFF:
+            result = BirthdayAttack._find_collision_table(hash_bytes, max_attempts)
+        else:
+            result = BirthdayAttack._find_collision_set(hash_bytes, max_attempts)
+        
+        if result is None:
+            print(f"[BIRTHDAY ATTACK] ✗ Colisão não encontrada em {max_attempts:,} tentativas")
+        return result
+    
+    @staticmethod
+    def _find_collision_table(hash_bytes: int, max_attempts: int) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Laço de find_collision com Numba: tabela de endereçamento aberto em
+        arrays numpy (chave uint64 + índice uint32, 12 bytes por slot)
+        
+        O índice aponta direto para o input no seu bloco do RNG, então a
+        colisão é reportada sem re-hashear nada.
+        """
+        keys = np.zeros(_BIRTHDAY_TABLE_SLOTS, np.uint64)
+        vals = np.zeros(_BIRTHDAY_TABLE_SLOTS, np.uint32)
+        pools: List[bytes] = []
         start_time = time.time()
         
-        for i in range(max_attempts):
-            # Gera input aleatório
-            input_data = secrets.token_bytes(16)
+        i = 0
+        while i < max_attempts:
+            batch = min(_BIRTHDAY_BATCH, max_attempts - i)
+            if 2 * (i + batch) > keys.shape[0]:
+                keys, vals = table_grow(keys, vals)
             
-            # Calcula hash truncado
-            full_hash = sha256(input_data)
-            truncated_hash = full_hash[:bits//8]
+            pool = secrets.token_bytes(16 * batch)
+            pools.append(pool)
+            prefixes = sha256_prefixes(np.frombuffer(pool, np.uint8), hash_bytes)
             
-            # Verifica colisão
-            if truncated_hash in hash_table:
-                original_input = hash_table[truncated_hash]
+            j = 0
+            while True:
+                j, previous = table_insert(keys, vals, prefixes, i, j)
+                if j < 0:
+                    break
+                # Só as chaves foram comparadas; o input tem de ser outro
+                block, offset = divmod(previous, _BIRTHDAY_BATCH)
+                original_input = pools[block][16 * offset:16 * offset + 16]
+                input_data = pool[16 * j:16 * j + 16]
                 if original_input != input_data:
-                    elapsed = time.time() - start_time
-                    print(f"[BIRTHDAY ATTACK] ✓ Colisão encontrada!")
-                    print(f"  Input 1: {original_input.hex()}")
-                    print(f"  Input 2: {input_data.hex()}")
-                    print(f"  Hash: {truncated_hash.hex()}")
-                    print(f"  Tentativas: {i+1:,}")
-                    print(f"  Tempo: {elapsed:.2f}s")
-                    return (original_input, input_data)
+                    return BirthdayAttack._report_collision(
+                        original_input, input_data, int(prefixes[j]), hash_bytes,
+                        i + j + 1, start_time)
+                j += 1
             
-            hash_table[truncated_hash] = input_data
+            if (i + batch) // 10000 > i // 10000:
+                BirthdayAttack._report_progress(i + batch, start_time)
+            i += batch
+        
+        return None
+    
+    @staticmethod
+    def _find_collision_set(hash_bytes: int, max_attempts: int) -> Optional[Tuple[bytes, bytes]]:
+        """Laço de find_collision em Python puro"""
+        # Só os hashes truncados (int big-endian) ficam num set; os inputs
+        # ficam nos blocos brutos do RNG, 16 bytes cada, sem objeto por input.
+        # O input original só é procurado nos blocos quando há colisão.
+        seen: set = set()
+        pools: List[bytes] = []
+        start_time = time.time()
+        
+        i = 0
+        while i < max_attempts:
+            # Uma única leitura do RNG do sistema por bloco, fatiada em inputs
+            batch = min(_BIRTHDAY_BATCH, max_attempts - i)
+            pool = secrets.token_bytes(16 * batch)
+            pools.append(pool)
+            inputs = [pool[j:j + 16] for j in range(0, 16 * batch, 16)]
+            keys = BirthdayAttack._hash_keys(pool, inputs, hash_bytes)
             
-            if (i + 1) % 10000 == 0:
-                elapsed = time.time() - start_time
-                rate = (i + 1) / elapsed
-                print(f"  Tentativas: {i+1:,} | Taxa: {rate:,.0f} hash/s")
+            for input_data, key in zip(inputs, keys):
+                # Verifica colisão
+                if key in seen:
+                    original_input = BirthdayAttack._find_original(pools, key, hash_bytes, input_data)
+                    if original_input is not None:
+                        return BirthdayAttack._report_collision(
+                            original_input, input_data, key, hash_bytes, i + 1, start_time)
+                
+                seen.add(key)
+                i += 1
+                
+                if i % 10000 == 0:
+                    BirthdayAttack._report_progress(i, start_time)
         
-        print(f"[BIRTHDAY ATTACK] ✗ Colisão não encontrada em {max_attempts:,} tentativas")
         return None
 
 
@@ -213,6 +422,11 @@ class RainbowTable:
         self.max_length = max_length
         self.chain_length = chain_length
         self.table: Dict[bytes, bytes] = {}
+        
+        # Charset já codificado (um bytes por símbolo) e seu tamanho, usados
+        # a cada passo de _reduce
+        self._symbols = [c.encode() for c in charset]
+        self._charset_len = len(charset)
     
     def _reduce(self, hash_value: bytes, iteration: int) -> bytes:
         """
@@ -223,12 +437,14 @@ class RainbowTable:
         seed = int.from_bytes(hash_value[:4], 'big') + iteration
         length = (seed % self.max_length) + 1
         
-        result = ''
+        symbols = self._symbols
+        base = self._charset_len
+        result = []
         for _ in range(length):
-            result += self.charset[seed % len(self.charset)]
-            seed //= len(self.charset)
+            seed, index = divmod(seed, base)
+            result.append(symbols[index])
         
-        return result.encode()
+        return b''.join(result)
     
     def generate(self, num_chains: int = 1000):
         """Gera rainbow table"""
@@ -261,29 +477,32 @@ class RainbowTable:
         """Procura pré-imagem na rainbow table"""
         print(f"[RAINBOW TABLE] Procurando {target_hash.hex()[:16]}...")
         
-        # Tenta cada posição na cadeia
-        for i in range(self.chain_length):
+        # Tenta cada posição i da cadeia (hipótese: alvo = hash da posição i),
+        # das mais próximas do endpoint para as mais distantes: as caminhadas
+        # curtas vêm primeiro. As funções de redução dependem da posição,
+        # então a caminhada de i não reaproveita a de i + 1.
+        reduce = self._reduce
+        for i in range(self.chain_length - 1, -1, -1):
             current_hash = target_hash
             
             # Segue cadeia até endpoint
             for j in range(i, self.chain_length):
-                current = self._reduce(current_hash, j)
-                current_hash = sha256(current)
+                current_hash = sha256(reduce(current_hash, j))
             
             # Verifica se endpoint está na tabela
-            if current_hash in self.table:
-                # Reconstrói cadeia desde o início
-                start_point = self.table[current_hash]
-                current = start_point
-                
-                for j in range(self.chain_length):
-                    if sha256(current) == target_hash:
-                        print(f"[RAINBOW TABLE] ✓ Pré-imagem encontrada!")
-                        print(f"  Input: {current.hex()}")
-                        return current
-                    
-                    hash_val = sha256(current)
-                    current = self._reduce(hash_val, j)
+            start_point = self.table.get(current_hash)
+            if start_point is None:
+                continue
+            
+            # Reconstrói a cadeia desde o início até a posição i, com um
+            # hash por passo; endpoint igual por acaso (falso alarme) segue
+            current = start_point
+            for j in range(i):
+                current = reduce(sha256(current), j)
+            if sha256(current) == target_hash:
+                print(f"[RAINBOW TABLE] ✓ Pré-imagem encontrada!")
+                print(f"  Input: {current.hex()}")
+                return current
         
         print(f"[RAINBOW TABLE] ✗ Pré-imagem não encontrada")
         return None
@@ -343,12 +562,18 @@ class NonceReuseAttack:
         s2 = sig2.s
         n = Secp256k1.n
         
+        # Um único inverso modular para os dois: 1/((s₁ - s₂)·r) mod n
+        s_diff = (s1 - s2) % n
+        inv = pow(s_diff * r % n, -1, n)
+        s_diff_inv = r * inv % n
+        r_inv = s_diff * inv % n
+        
         # Recupera k
-        k = ((e1 - e2) * pow(s1 - s2, -1, n)) % n
+        k = ((e1 - e2) * s_diff_inv) % n
         print(f"  ✓ Nonce recuperado: k = {hex(k)[:18]}...")
         
         # Recupera chave privada
-        private_key = ((s1 * k - e1) * pow(r, -1, n)) % n
+        private_key = ((s1 * k - e1) * r_inv) % n
         print(f"  ✓ Chave privada recuperada: {hex(private_key)[:18]}...")
         
         return private_key
@@ -377,7 +602,6 @@ class NonceReuseAttack:
         e1 = int.from_bytes(double_sha256(msg1), 'big')
         e2 = int.from_bytes(double_sha256(msg2), 'big')
         
-        G = Point(Secp256k1.Gx, Secp256k1.Gy)
         from bitcoin_crypto import point_multiply
         R = point_multiply(fixed_nonce, G)
         
@@ -432,22 +656,8 @@ class WeakRNGAttack:
         Returns:
             Chi-quadrado (quanto menor, mais aleatório)
         """
-        # Distribui amostras em bins
-        max_val = max(samples)
-        bin_size = max_val // num_bins
-        
-        observed = [0] * num_bins
-        for sample in samples:
-            bin_idx = min(sample // bin_size, num_bins - 1)
-            observed[bin_idx] += 1
-        
-        # Frequência esperada (uniforme)
-        expected = len(samples) / num_bins
-        
-        # Chi-quadrado
-        chi_squared = sum((obs - expected)**2 / expected for obs in observed)
-        
-        return chi_squared
+        # Distribui amostras em bins e compara com a frequência uniforme
+        return float(chi_squared(np.asarray(samples, dtype=np.int64), num_bins))
     
     @staticmethod
     def demonstrate_weak_rng():
@@ -465,11 +675,7 @@ class WeakRNGAttack:
         
         # RNG fraco (LCG simples)
         print("\n[2] RNG Fraco (Linear Congruential Generator):")
-        seed = 12345
-        weak_samples = []
-        for _ in range(1000):
-            seed = (1103515245 * seed + 12345) % (2**31)
-            weak_samples.append(seed % 1000000)
+        weak_samples = lcg_samples(12345, 1000, 1000000)
         
         weak_chi = WeakRNGAttack.test_randomness(weak_samples)
         print(f"  Chi-quadrado: {weak_chi:.2f}")
@@ -493,32 +699,40 @@ class TimingAttack:
     """
     
     @staticmethod
-    def vulnerable_compare(a: bytes, b: bytes) -> bool:
-        """Comparação VULNERÁVEL (para no primeiro byte diferente)"""
+    def _simulate_work():
+        """Simula operação lenta por byte, para o sinal de tempo ser visível"""
+        time.sleep(0.0001)
+    
+    @staticmethod
+    def vulnerable_compare(a: bytes, b: bytes, slow: bool = False) -> bool:
+        """
+        Comparação VULNERÁVEL (para no primeiro byte diferente)
+        
+        slow=True acrescenta trabalho simulado por byte comparado (demonstração)
+        """
         if len(a) != len(b):
             return False
         
         for i in range(len(a)):
             if a[i] != b[i]:
                 return False
-            # Simula operação lenta
-            time.sleep(0.0001)
+            if slow:
+                TimingAttack._simulate_work()
         
         return True
     
     @staticmethod
-    def secure_compare(a: bytes, b: bytes) -> bool:
-        """Comparação SEGURA (tempo constante)"""
-        if len(a) != len(b):
-            return False
-        
-        result = 0
-        for i in range(len(a)):
-            result |= a[i] ^ b[i]
-            # Sempre executa todas as comparações
-            time.sleep(0.0001)
+    def secure_compare(a: bytes, b: bytes, slow: bool = False) -> bool:
+        """
+        Comparação SEGURA (tempo constante): hmac.compare_digest, em C
         
-        return result == 0
+        slow=True acrescenta o mesmo trabalho simulado para todos os bytes,
+        para comparar com vulnerable_compare na demonstração
+        """
+        if slow:
+            for _ in range(len(a)):
+                TimingAttack._simulate_work()
+        return hmac.compare_digest(a, b)
     
     @staticmethod
     def demonstrate_timing_attack():
@@ -537,7 +751,7 @@ class TimingAttack:
             guess = secret[:length] + b"X" * (14 - length)
             
             start = time.time()
-            result = TimingAttack.vulnerable_compare(secret, guess)
+            result = TimingAttack.vulnerable_compare(secret, guess, slow=True)
             elapsed = time.time() - start
             
             print(f"  Tentativa: {guess.decode():20s} | Tempo: {elapsed*1000:.2f}ms")
@@ -551,7 +765,7 @@ class TimingAttack:
             guess = secret[:length] + b"X" * (14 - length)
             
             start = time.time()
-            result = TimingAttack.secure_compare(secret, guess)
+            result = TimingAttack.secure_compare(secret, guess, slow=True)
             elapsed = time.time() - start
             
             print(f"  Tentativa: {guess.decode():20s} | Tempo: {elapsed*1000:.2f}ms")
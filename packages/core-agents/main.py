@@ -1,12 +1,13 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 import uvicorn
 import asyncio
 import random # Added for jitter
 from contextlib import asynccontextmanager
 from agents.researcher import ResearchAgent
-from agents.quant import QuantitativeAgent
+from agents.quant import QuantitativeAgent, chart_to_records
 from agents.market_data import MarketDataAgent
 from agents.decision_engine import DecisionEngine
 from agents.execution_agent import ExecutionAgent # Added
@@ -19,10 +20,12 @@ from typing import Optional
 # Import API routers
 import sys
 import os
-sys.path.append(os.path.dirname(__file__))
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _CORE_DIR not in sys.path:
+    sys.path.insert(0, _CORE_DIR)
 try:
     from api.universe_api import router as universe_router
-    from api.crypto_api import router as crypto_router
+    from api.crypto_api import router as crypto_router, shutdown_cpu_pool
     ADVANCED_APIs_AVAILABLE = True
 except Exception as e:
     print(f"⚠️  Advanced APIs not available: {e}")
@@ -124,6 +127,11 @@ async def lifespan(app: FastAPI):
         await decision_engine.close()
     if research_agent:
         await research_agent.close()
+    await execution_agent.close()
+    if market_agent:
+        await market_agent.close()
+    if ADVANCED_APIs_AVAILABLE:
+        shutdown_cpu_pool()
 
 app = FastAPI(
     title="Reality Architect Core",
@@ -377,15 +385,21 @@ async def get_price(ticker: str):
     agent = MarketDataAgent()
     return await agent.fetch_price(ticker)
 
-@app.get("/quant/chart/{ticker}")
+@app.get("/quant/chart/{ticker}", response_class=ORJSONResponse)
 async def get_chart_data(ticker: str):
     """
     Returns high-fidelity chart data from the Math Wizard.
     """
     if not quant_agent:
         return {"error": "Quant Agent not fully materialized"}
-    return await quant_agent.get_market_chart(ticker)
+    return chart_to_records(await quant_agent.get_market_chart(ticker))
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8081, reload=True)
+    # uvloop (libuv) when installed via uvicorn[standard]; plain asyncio otherwise
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    uvicorn.run("main:app", host="0.0.0.0", port=8081, reload=True, loop=loop)
 
@@ -0,0 +1,193 @@
+"""
+Kernels numéricos do sistema de 32 universos.
+
+φ(t) é despachada pelo índice do universo (não pelo nome), o que permite
+compilar com Numba tanto a avaliação de φ quanto o passo de evolução e a
+matriz de correlação. Sem Numba as mesmas funções rodam como Python puro.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Decorador identidade usado quando o Numba não está instalado."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Passo das diferenças finitas centrais em dφ/dt
+DERIVATIVE_STEP = 1e-6
+
+
+@njit(cache=True, fastmath=True)
+def phi_kernel(k, t):
+    """φ(t) do universo de índice k (mesma ordem de _initialize_universes)"""
+    if k == 0:    # BOOLE
+        return np.sign(np.sin(2*np.pi*t))
+    elif k == 1:  # ASSEMBLY
+        return np.floor(t) % 256
+    elif k == 2:  # FORTRAN
+        return np.exp(-0.1*t) * np.cos(3*t)
+    elif k == 3:  # LISP
+        return np.tanh(np.sin(5*t))
+    elif k == 4:  # COBOL
+        return np.log1p(abs(np.sin(t))) * np.sign(np.sin(t))
+    elif k == 5:  # ALGOL
+        return (t % 7) / 7.0
+    elif k == 6:  # C
+        return np.sin(11*t) * np.exp(-0.05*t)
+    elif k == 7:  # C++
+        return np.sin(13*t) + 0.5*np.sin(26*t)
+    elif k == 8:  # MATLAB
+        return np.sin(17*t) * np.cos(19*t)
+    elif k == 9:  # PYTHON
+        return np.sin(23*t) * (1 + 0.3*np.sin(3*t))
+    elif k == 10:  # JAVA
+        return np.sin(29*t) * np.exp(-0.02*t)
+    elif k == 11:  # JAVASCRIPT
+        return np.sin(31*t) + 0.3*np.sin(62*t) + 0.1*np.sin(93*t)
+    elif k == 12:  # GO
+        return np.sin(37*t) * np.cos(41*t)
+    elif k == 13:  # RUST
+        return np.tanh(np.sin(43*t))
+    elif k == 14:  # CUDA
+        total = 0.0
+        for i in range(8):
+            total += np.sin((47+i)*t)
+        return total / 8
+    elif k == 15:  # SQL
+        return np.floor(np.sin(53*t) * 10) / 10
+    elif k == 16:  # SHELL
+        return np.sign(np.sin(59*t)) * abs(np.sin(59*t))**0.5
+    elif k == 17:  # POWERSHELL
+        return np.sin(61*t) * (1 + 0.2*np.cos(t))
+    elif k == 18:  # PHP
+        return np.sin(67*t) * np.exp(-0.03*t)
+    elif k == 19:  # RUBY
+        return np.sin(71*t) * np.sin(73*t)
+    elif k == 20:  # SCALA
+        return np.sin(79*t) + 0.5*np.cos(83*t)
+    elif k == 21:  # HASKELL
+        return np.cos(89*t) * np.exp(-0.01*t)
+    elif k == 22:  # ERLANG
+        return np.sin(97*t) * (1 + 0.5*np.sin(t/10))
+    elif k == 23:  # KOTLIN
+        return np.sin(101*t) * np.cos(103*t)
+    elif k == 24:  # SWIFT
+        return np.tanh(np.sin(107*t) * 2)
+    elif k == 25:  # JULIA
+        return np.sin(109*t) * np.exp(-0.005*t)
+    elif k == 26:  # NIM
+        return np.sin(113*t) * abs(np.cos(t))
+    elif k == 27:  # LUA
+        return np.sin(127*t) + 0.3*np.sin(254*t)
+    elif k == 28:  # DART
+        return np.sin(131*t) * np.cos(137*t)
+    elif k == 29:  # GROOVY
+        return np.sin(139*t) * (1 + 0.2*np.sin(5*t))
+    elif k == 30:  # OBJC
+        return np.sin(149*t) * np.exp(-0.04*t)
+    elif k == 31:  # SCRATCH
+        return np.rint(np.sin(151*t) * 10) / 10
+    return 0.0
+
+
+@njit(cache=True, fastmath=True)
+def derivative_kernel(k, t):
+    """dφ/dt ≈ (φ(t+h) - φ(t-h)) / 2h"""
+    h = DERIVATIVE_STEP
+    return (phi_kernel(k, t + h) - phi_kernel(k, t - h)) / (2 * h)
+
+
+@njit(cache=True, fastmath=True)
+def phi_samples(n, t_values):
+    """Matriz (n, len(t_values)) com φ de cada universo em cada instante"""
+    out = np.empty((n, t_values.shape[0]))
+    for k in range(n):
+        for j in range(t_values.shape[0]):
+            out[k, j] = phi_kernel(k, t_values[j])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def evolve_kernel(t, dt, freq, phi, dphi_dt, integral, energy, phase):
+    """
+    Um passo de evolução de todos os universos, in-place sobre os arrays SoA
+
+    E = (1/2) * (dφ/dt)² + φ²/2; a fase avança freq * dt (mod 2π).
+    """
+    two_pi = 2 * np.pi
+    for k in range(freq.shape[0]):
+        p = phi_kernel(k, t)
+        d = derivative_kernel(k, t)
+        phi[k] = p
+        dphi_dt[k] = d
+        integral[k] += p * dt
+        energy[k] = 0.5 * d * d + 0.5 * p * p
+        phase[k] = (phase[k] + freq[k] * dt) % two_pi
+
+
+@njit(cache=True, fastmath=True)
+def correlation_kernel(samples):
+    """
+    C_ij = <φᵢ * φⱼ> / (σᵢ * σⱼ), com diagonal 1 e 0 onde σ = 0
+    """
+    n, m = samples.shape
+    std = np.empty(n)
+    for i in range(n):
+        std[i] = np.std(samples[i])
+
+    correlation = np.zeros((n, n))
+    for i in range(n):
+        correlation[i, i] = 1.0
+        for j in range(i + 1, n):
+            if std[i] > 0 and std[j] > 0:
+                cov = 0.0
+                for s in range(m):
+                    cov += samples[i, s] * samples[j, s]
+                c = (cov / m) / (std[i] * std[j])
+                correlation[i, j] = c
+                correlation[j, i] = c
+    return correlation
+
+
+@njit(cache=True, fastmath=True)
+def phi_series(k, t_values):
+    """φ do universo k em cada instante de t_values"""
+    out = np.empty(t_values.shape[0])
+    for j in range(t_values.shape[0]):
+        out[j] = phi_kernel(k, t_values[j])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def derivative_series(k, t_values):
+    """dφ/dt do universo k em cada instante de t_values"""
+    out = np.empty(t_values.shape[0])
+    for j in range(t_values.shape[0]):
+        out[j] = derivative_kernel(k, t_values[j])
+    return out
+
+
+@njit(cache=True)
+def evolve_steps_kernel(n_steps, t, dt, freq, phi, dphi_dt, integral, energy, phase):
+    """
+    n_steps passos de evolve_kernel num único laço compilado
+
+    Retorna (t final, t do último passo em que a entropia seria atualizada,
+    ou NaN). Sem fastmath: int(t / dt) decide o passo da entropia e tem de
+    arredondar exatamente como em Python.
+    """
+    entropy_t = np.nan
+    for _ in range(n_steps):
+        evolve_kernel(t, dt, freq, phi, dphi_dt, integral, energy, phase)
+        if int(t / dt) % 10 == 0:
+            entropy_t = t
+        t += dt
+    return t, entropy_t
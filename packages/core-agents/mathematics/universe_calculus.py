@@ -11,12 +11,19 @@ Cada universo possui:
 """
 
 import numpy as np
-from scipy import integrate, fft, signal
-from scipy.linalg import expm
 from typing import Dict, List, Tuple, Callable
 from dataclasses import dataclass
 import math
 
+from mathematics._universe_kernels import (
+    phi_kernel,
+    phi_series,
+    phi_samples,
+    derivative_series,
+    evolve_steps_kernel,
+    correlation_kernel,
+)
+
 @dataclass
 class UniverseState:
     """Estado matemático de um universo"""
@@ -32,6 +39,10 @@ class UniverseState:
     coupling: Dict[int, float]  # Acoplamento com outros universos
 
 
+# Colunas de UniverseCalculus.state_arrays()
+STATE_FIELDS = ("phi", "dphi_dt", "integral", "energy", "phase", "entropy")
+
+
 class UniverseCalculus:
     """
     Sistema de 32 Universos com Matemática Rigorosa
@@ -48,6 +59,27 @@ class UniverseCalculus:
         self.dt = 0.01  # Passo temporal
         self.coupling_matrix = self._create_coupling_matrix()
         
+        # Acoplamento é constante: preenche uma vez em vez de a cada passo
+        for i, u in enumerate(self.universes):
+            u.coupling = {j: self.coupling_matrix[i][j]
+                          for j in range(len(self.universes)) if j != i}
+        
+        # Estado em SoA para os kernels; UniverseState é a visão pública,
+        # sincronizada ao fim de cada evolve_step
+        self._freq = np.array([u.frequency for u in self.universes])
+        self._phi = np.array([u.phi for u in self.universes], dtype=np.float64)
+        self._dphi_dt = np.zeros(len(self.universes))
+        self._integral = np.zeros(len(self.universes))
+        self._energy = np.zeros(len(self.universes))
+        self._phase = np.zeros(len(self.universes))
+        self._entropy = np.zeros(len(self.universes))
+        # Triângulo superior: cada par (i < j) entra uma vez na energia de acoplamento
+        self._coupling_upper = np.triu(self.coupling_matrix, 1)
+        
+        # Resultados derivados do estado atual (energias, correlação), reaproveitados
+        # entre requests/clientes WebSocket até o próximo passo de evolução
+        self._cache: Dict = {}
+        
     def _initialize_universes(self) -> List[UniverseState]:
         """
         Inicializa os 32 universos com funções características únicas
@@ -218,75 +250,7 @@ class UniverseCalculus:
     
     def phi_function(self, universe_id: int, t: float) -> float:
         """Calcula φ(t) para um universo específico"""
-        u = self.universes[universe_id]
-        
-        # Função base
-        if u.name == "BOOLE":
-            return np.sign(np.sin(2*np.pi*t))
-        elif u.name == "ASSEMBLY":
-            return np.floor(t) % 256
-        elif u.name == "FORTRAN":
-            return np.exp(-0.1*t) * np.cos(3*t)
-        elif u.name == "LISP":
-            return np.tanh(np.sin(5*t))
-        elif u.name == "COBOL":
-            return np.log1p(abs(np.sin(t))) * np.sign(np.sin(t))
-        elif u.name == "ALGOL":
-            return (t % 7) / 7.0
-        elif u.name == "C":
-            return np.sin(11*t) * np.exp(-0.05*t)
-        elif u.name == "C++":
-            return np.sin(13*t) + 0.5*np.sin(26*t)
-        elif u.name == "MATLAB":
-            return np.sin(17*t) * np.cos(19*t)
-        elif u.name == "PYTHON":
-            return np.sin(23*t) * (1 + 0.3*np.sin(3*t))
-        elif u.name == "JAVA":
-            return np.sin(29*t) * np.exp(-0.02*t)
-        elif u.name == "JAVASCRIPT":
-            return np.sin(31*t) + 0.3*np.sin(62*t) + 0.1*np.sin(93*t)
-        elif u.name == "GO":
-            return np.sin(37*t) * np.cos(41*t)
-        elif u.name == "RUST":
-            return np.tanh(np.sin(43*t))
-        elif u.name == "CUDA":
-            return np.sum([np.sin((47+i)*t) for i in range(8)]) / 8
-        elif u.name == "SQL":
-            return np.floor(np.sin(53*t) * 10) / 10
-        elif u.name == "SHELL":
-            return np.sign(np.sin(59*t)) * abs(np.sin(59*t))**0.5
-        elif u.name == "POWERSHELL":
-            return np.sin(61*t) * (1 + 0.2*np.cos(t))
-        elif u.name == "PHP":
-            return np.sin(67*t) * np.exp(-0.03*t)
-        elif u.name == "RUBY":
-            return np.sin(71*t) * np.sin(73*t)
-        elif u.name == "SCALA":
-            return np.sin(79*t) + 0.5*np.cos(83*t)
-        elif u.name == "HASKELL":
-            return np.cos(89*t) * np.exp(-0.01*t)
-        elif u.name == "ERLANG":
-            return np.sin(97*t) * (1 + 0.5*np.sin(t/10))
-        elif u.name == "KOTLIN":
-            return np.sin(101*t) * np.cos(103*t)
-        elif u.name == "SWIFT":
-            return np.tanh(np.sin(107*t) * 2)
-        elif u.name == "JULIA":
-            return np.sin(109*t) * np.exp(-0.005*t)
-        elif u.name == "NIM":
-            return np.sin(113*t) * abs(np.cos(t))
-        elif u.name == "LUA":
-            return np.sin(127*t) + 0.3*np.sin(254*t)
-        elif u.name == "DART":
-            return np.sin(131*t) * np.cos(137*t)
-        elif u.name == "GROOVY":
-            return np.sin(139*t) * (1 + 0.2*np.sin(5*t))
-        elif u.name == "OBJC":
-            return np.sin(149*t) * np.exp(-0.04*t)
-        elif u.name == "SCRATCH":
-            return np.round(np.sin(151*t) * 10) / 10
-        
-        return 0.0
+        return phi_kernel(universe_id, t)
     
     def compute_derivative(self, universe_id: int, t: float, dt: float = 1e-6) -> float:
         """
@@ -306,8 +270,9 @@ class UniverseCalculus:
         Energia acumulada no intervalo [t_start, t_end]
         """
         t_values = np.linspace(t_start, t_end, n_points)
-        phi_values = np.array([self.phi_function(universe_id, t) for t in t_values])
+        phi_values = phi_series(universe_id, t_values)
         
+        from scipy import integrate  # import tardio: scipy custa ~0.4 s no boot
         integral = integrate.simpson(phi_values, x=t_values)
         return integral
     
@@ -335,16 +300,17 @@ class UniverseCalculus:
         Retorna (frequências, amplitudes)
         """
         t_values = np.linspace(0, t_max, n_samples)
-        phi_values = np.array([self.phi_function(universe_id, t) for t in t_values])
+        phi_values = phi_series(universe_id, t_values)
         
-        # FFT
-        fft_values = fft.fft(phi_values)
-        frequencies = fft.fftfreq(n_samples, d=t_max/n_samples)
+        # FFT real: φ(t) é real, então o espectro é simétrico e rfft calcula
+        # só a metade não negativa
+        from scipy import fft  # import tardio (ver compute_integral)
+        fft_values = fft.rfft(phi_values, workers=-1)
+        frequencies = fft.rfftfreq(n_samples, d=t_max/n_samples)
         
-        # Apenas frequências positivas
-        positive_freq_idx = frequencies > 0
-        frequencies = frequencies[positive_freq_idx]
-        amplitudes = np.abs(fft_values[positive_freq_idx])
+        # Apenas frequências positivas (descarta a componente DC)
+        frequencies = frequencies[1:]
+        amplitudes = np.abs(fft_values[1:])
         
         return frequencies, amplitudes
     
@@ -356,58 +322,47 @@ class UniverseCalculus:
         """
         # Amostra φ(t) em uma janela temporal
         t_values = np.linspace(t - window/2, t + window/2, 1000)
-        phi_values = np.array([self.phi_function(universe_id, t_val) for t_val in t_values])
-        
-        # Histograma (distribuição de probabilidade)
-        hist, bin_edges = np.histogram(phi_values, bins=50, density=True)
-        bin_width = bin_edges[1] - bin_edges[0]
-        probabilities = hist * bin_width
-        
-        # Remove zeros para evitar log(0)
-        probabilities = probabilities[probabilities > 0]
-        
-        # Entropia de Shannon
-        entropy = -np.sum(probabilities * np.log2(probabilities))
-        
-        return entropy
+        return _shannon_entropy(phi_series(universe_id, t_values))
     
     def evolve_step(self, dt: float = None):
+        """Evolui todos os universos por um passo temporal"""
+        self.evolve_n_steps(1, dt)
+    
+    def evolve_n_steps(self, n_steps: int, dt: float = None):
         """
-        Evolui todos os universos por um passo temporal
+        Evolui todos os universos por n_steps passos temporais
         
-        Usa método de Runge-Kutta de 4ª ordem (RK4)
+        Os passos rodam em evolve_steps_kernel sobre os arrays SoA; depois
+        os valores são copiados uma vez para os UniverseState. A entropia
+        (atualizada a cada 10 passos) só é calculada para o último passo
+        que a atualizaria, já que os anteriores seriam sobrescritos.
         """
         if dt is None:
             dt = self.dt
         
-        t = self.time
-        
-        for i, u in enumerate(self.universes):
-            # Atualiza φ
-            u.phi = self.phi_function(i, t)
-            
-            # Atualiza derivada
-            u.dphi_dt = self.compute_derivative(i, t)
-            
-            # Atualiza integral (acumulada)
-            u.integral += u.phi * dt
-            
-            # Atualiza energia
-            u.energy = self.compute_energy(i, t)
-            
-            # Atualiza fase
-            u.phase = (u.phase + u.frequency * dt) % (2 * np.pi)
-            
-            # Atualiza entropia (a cada 10 passos para eficiência)
-            if int(t / dt) % 10 == 0:
-                u.entropy = self.compute_entropy(i, t)
-            
-            # Atualiza acoplamento
-            for j in range(len(self.universes)):
-                if i != j:
-                    u.coupling[j] = self.coupling_matrix[i][j]
-        
-        self.time += dt
+        self._cache.clear()
+        self.time, entropy_t = evolve_steps_kernel(
+            n_steps, self.time, dt, self._freq, self._phi, self._dphi_dt,
+            self._integral, self._energy, self._phase
+        )
+        
+        entropies = None
+        if not math.isnan(entropy_t):
+            samples = phi_samples(len(self.universes),
+                                  np.linspace(entropy_t - 5.0, entropy_t + 5.0, 1000))
+            entropies = [_shannon_entropy(row) for row in samples]
+            self._entropy[:] = entropies
+        
+        for i, (u, phi, dphi_dt, integral, energy, phase) in enumerate(zip(
+                self.universes, self._phi.tolist(), self._dphi_dt.tolist(),
+                self._integral.tolist(), self._energy.tolist(), self._phase.tolist())):
+            u.phi = phi
+            u.dphi_dt = dphi_dt
+            u.integral = integral
+            u.energy = energy
+            u.phase = phase
+            if entropies is not None:
+                u.entropy = entropies[i]
     
     def get_universe_state(self, universe_id: int) -> Dict:
         """Retorna estado completo de um universo"""
@@ -431,27 +386,39 @@ class UniverseCalculus:
         """Retorna estados de todos os universos"""
         return [self.get_universe_state(i) for i in range(len(self.universes))]
     
+    def _cached(self, key, compute: Callable):
+        """Valor de `key` no estado atual; invalidado a cada evolve_n_steps"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+    
     def compute_total_energy(self) -> float:
         """Calcula energia total do sistema multiversal"""
-        return sum(u.energy for u in self.universes)
+        return self._cached("total_energy", lambda: float(self._energy.sum()))
     
     def compute_coupling_energy(self) -> float:
         """
         Calcula energia de acoplamento entre universos
         
-        E_coupling = Σᵢⱼ Cᵢⱼ * φᵢ * φⱼ
+        E_coupling = Σᵢ<ⱼ Cᵢⱼ * φᵢ * φⱼ
         """
-        energy = 0.0
-        n = len(self.universes)
-        
-        for i in range(n):
-            for j in range(i+1, n):
-                coupling = self.coupling_matrix[i][j]
-                phi_i = self.universes[i].phi
-                phi_j = self.universes[j].phi
-                energy += coupling * phi_i * phi_j
+        return self._cached("coupling_energy",
+                            lambda: float(self._phi @ self._coupling_upper @ self._phi))
+    
+    def compute_energies(self) -> Tuple[float, float]:
+        """Retorna (energia total, energia de acoplamento) do passo atual"""
+        return self.compute_total_energy(), self.compute_coupling_energy()
+    
+    def state_arrays(self) -> np.ndarray:
+        """
+        Estado numérico de todos os universos como matriz (N, 6)
         
-        return energy
+        Colunas: STATE_FIELDS (phi, dphi_dt, integral, energy, phase, entropy)
+        """
+        return np.column_stack((self._phi, self._dphi_dt, self._integral,
+                                self._energy, self._phase, self._entropy))
     
     def find_resonances(self) -> List[Tuple[int, int, float]]:
         """
@@ -505,40 +472,43 @@ class UniverseCalculus:
 
 # Funções auxiliares para análise avançada
 
+def _shannon_entropy(phi_values: np.ndarray) -> float:
+    """
+    Entropia informacional de Shannon de uma amostra de φ
+    
+    H = -Σ p(x) * log(p(x))
+    """
+    # Histograma (distribuição de probabilidade)
+    hist, bin_edges = np.histogram(phi_values, bins=50, density=True)
+    bin_width = bin_edges[1] - bin_edges[0]
+    probabilities = hist * bin_width
+    
+    # Remove zeros para evitar log(0)
+    probabilities = probabilities[probabilities > 0]
+    
+    # Entropia de Shannon
+    return -np.sum(probabilities * np.log2(probabilities))
+
+
 def compute_correlation_matrix(calc: UniverseCalculus, t: float) -> np.ndarray:
     """
     Calcula matriz de correlação entre universos
     
     C_ij = <φᵢ * φⱼ> / sqrt(<φᵢ²> * <φⱼ²>)
     """
-    n = len(calc.universes)
-    correlation = np.zeros((n, n))
-    
-    # Janela temporal para média
-    window = 10.0
-    n_samples = 100
-    t_values = np.linspace(t - window/2, t + window/2, n_samples)
-    
-    # Calcula φ para todos os universos em todos os tempos
-    phi_matrix = np.zeros((n, n_samples))
-    for i in range(n):
-        for j, t_val in enumerate(t_values):
-            phi_matrix[i, j] = calc.phi_function(i, t_val)
-    
-    # Calcula correlações
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                correlation[i, j] = 1.0
-            else:
-                cov = np.mean(phi_matrix[i] * phi_matrix[j])
-                std_i = np.std(phi_matrix[i])
-                std_j = np.std(phi_matrix[j])
-                
-                if std_i > 0 and std_j > 0:
-                    correlation[i, j] = cov / (std_i * std_j)
-    
-    return correlation
+    def compute():
+        # Janela temporal para média
+        window = 10.0
+        n_samples = 100
+        t_values = np.linspace(t - window/2, t + window/2, n_samples)
+        
+        # φ de todos os universos em todos os tempos, depois correlações
+        phi_matrix = phi_samples(len(calc.universes), t_values)
+        correlation = correlation_kernel(phi_matrix)
+        correlation.flags.writeable = False  # compartilhada entre chamadores
+        return correlation
+    
+    return calc._cached(("correlation", t), compute)
 
 
 def compute_phase_space_trajectory(calc: UniverseCalculus, universe_id: int,
@@ -547,8 +517,8 @@ def compute_phase_space_trajectory(calc: UniverseCalculus, universe_id: int,
     Calcula trajetória no espaço de fase (φ, dφ/dt)
     """
     t_values = np.linspace(0, t_max, n_points)
-    phi_values = np.array([calc.phi_function(universe_id, t) for t in t_values])
-    dphi_values = np.array([calc.compute_derivative(universe_id, t) for t in t_values])
+    phi_values = phi_series(universe_id, t_values)
+    dphi_values = derivative_series(universe_id, t_values)
     
     return phi_values, dphi_values
 
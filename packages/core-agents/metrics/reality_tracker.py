@@ -3,6 +3,7 @@ Reality Metrics Tracker - Persistent Edition
 Measures REAL, OBSERVABLE value generated by the system.
 Now with Database persistence for continuous learning.
 """
+from collections import deque
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from loguru import logger
@@ -11,8 +12,8 @@ from database.db import async_session, init_db
 from database.models import DecisionRecord, RealityStats
 from agents.market_data import MarketDataAgent
 
-# Global Intelligence Buffer for UI transparency
-intelligence_buffer = []
+# Global Intelligence Buffer for UI transparency (oldest entries drop off)
+intelligence_buffer: deque = deque(maxlen=50)
 
 class RealityMetrics:
     """
@@ -24,6 +25,10 @@ class RealityMetrics:
         self.accuracy = 0
         self.active_ticker = "BTC"
         self.session_start = datetime.now()
+        # Recent decision ids, bounded so long sessions keep flat memory.
+        # log_count keeps counting past the bound and drives chat's evolution_level.
+        self.logs: deque = deque(maxlen=10_000)
+        self.log_count = 0
         logger.info("🎯 Reality Metrics Tracker (Persistent) synchronized")
     
     async def track_decision(
@@ -44,6 +49,8 @@ class RealityMetrics:
         """
         Track a new decision and save to physical storage.
         """
+        self.logs.append(decision_id)
+        self.log_count += 1
         async with async_session() as session:
             record = DecisionRecord(
                 id=decision_id,
@@ -81,8 +88,6 @@ class RealityMetrics:
             "data": data
         }
         intelligence_buffer.append(entry)
-        if len(intelligence_buffer) > 50:
-            intelligence_buffer.pop(0)
         logger.debug(f"🧠 Intelligence added: {category} for {ticker}")
 
     async def check_pending_outcomes(self, market_agent: MarketDataAgent):
@@ -239,7 +244,7 @@ class RealityMetrics:
             "raw_intelligence": {
                 "research": research_logs,
                 "market": market_stats,
-                "all": intelligence_buffer[-10:]
+                "all": list(intelligence_buffer)[-10:]
             },
             "today": {
                 "decisions_made": m24h["total_decisions"],
@@ -0,0 +1,87 @@
+from contextlib import asynccontextmanager
+from loguru import logger
+import asyncio
+import os
+import time
+
+
+def _parse_seconds(value, default: float = 1.0) -> float:
+    """Parses header durations like '12', '1.5' or '20s'."""
+    if not value:
+        return default
+    try:
+        return max(float(value.strip().rstrip("s")), 0.0)
+    except ValueError:
+        return default
+
+
+class AIMDLimiter:
+    """
+    Request-rate + adaptive-concurrency gate for an upstream API.
+
+    Starts are spaced to stay under `rpm`. The concurrency ceiling grows
+    additively (alpha per window of successes) and is cut multiplicatively
+    (beta) on 429/5xx. Retry-After and low x-ratelimit-remaining-* headers
+    pause every caller until the provider's window resets.
+    """
+
+    def __init__(self, rpm: int, initial_concurrency: float = 4.0,
+                 min_concurrency: float = 1.0, max_concurrency: float = 32.0,
+                 alpha: float = 0.5, beta: float = 0.5):
+        self.interval = 60.0 / rpm
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.alpha = alpha
+        self.beta = beta
+        self.concurrency = initial_concurrency
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one request slot for the duration of the block."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self.concurrency))
+            self._in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._next_start, self._paused_until)
+            self._next_start = start + self.interval
+        try:
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def observe(self, response):
+        """Feeds a response's status and rate-limit headers back into the controller."""
+        status = response.status_code
+        headers = response.headers
+        now = time.monotonic()
+
+        if status == 429 or status >= 500:
+            self.concurrency = max(self.min_concurrency, self.concurrency * self.beta)
+            if "retry-after" in headers:
+                self._paused_until = max(self._paused_until, now + _parse_seconds(headers["retry-after"]))
+            logger.warning(f"⏳ Upstream throttled ({status}); concurrency -> {self.concurrency:.1f}")
+            return
+
+        self.concurrency = min(self.max_concurrency, self.concurrency + self.alpha / self.concurrency)
+
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        limit = headers.get("x-ratelimit-limit-requests")
+        if remaining and limit:
+            try:
+                if int(remaining) < 0.1 * int(limit):
+                    reset = _parse_seconds(headers.get("x-ratelimit-reset-requests"))
+                    self._paused_until = max(self._paused_until, now + reset)
+            except ValueError:
+                pass
+
+
+# Shared by ResearchAgent and WebLearningAgent (same Perplexity account)
+perplexity_limiter = AIMDLimiter(rpm=int(os.getenv("PERPLEXITY_RPM", "50")))
@@ -0,0 +1,38 @@
+from typing import Any, Dict, List
+import httpx
+import orjson
+
+
+async def stream_chat_completion(client: httpx.AsyncClient, url: str, payload: Dict[str, Any],
+                                 limiter=None) -> Dict[str, Any]:
+    """
+    POSTs an OpenAI-style chat completion with `stream: true` and folds the
+    SSE deltas into the final message, so the body is never buffered whole.
+    Returns {"content": str, "citations": list}. Raises httpx.HTTPStatusError
+    on non-2xx responses, like raise_for_status().
+    """
+    parts: List[str] = []
+    citations: List[str] = []
+
+    async with client.stream("POST", url, json={**payload, "stream": True}) as response:
+        if limiter is not None:
+            limiter.observe(response)
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            event = orjson.loads(data)
+            # Citations are repeated on every chunk; the last one is complete
+            citations = event.get("citations", citations)
+            for choice in event.get("choices", ()):
+                content = choice.get("delta", {}).get("content")
+                if content:
+                    parts.append(content)
+
+    return {"content": "".join(parts), "citations": citations}
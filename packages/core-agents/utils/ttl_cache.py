@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from functools import wraps
+import inspect
+import time
+
+
+def ttl_cache(maxsize: int = 128, ttl: float = 60.0):
+    """
+    Bounded LRU memo whose entries expire after `ttl` seconds.
+    Works on plain and async callables (the awaited result is cached,
+    not the coroutine). Arguments must be hashable.
+    """
+    def decorator(func):
+        cache: OrderedDict = OrderedDict()
+
+        def _lookup(key):
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] >= ttl:
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return entry
+
+        def _store(key, value):
+            cache[key] = (value, time.monotonic())
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = (args, tuple(sorted(kwargs.items())))
+                entry = _lookup(key)
+                if entry is not None:
+                    return entry[0]
+                value = await func(*args, **kwargs)
+                _store(key, value)
+                return value
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (args, tuple(sorted(kwargs.items())))
+                entry = _lookup(key)
+                if entry is not None:
+                    return entry[0]
+                value = func(*args, **kwargs)
+                _store(key, value)
+                return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
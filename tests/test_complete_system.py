@@ -166,6 +166,28 @@ class TestBitcoinCryptography:
         assert public_key.x > 0
         assert public_key.y > 0
     
+    def test_shamir_double_multiplication(self):
+        """Testa k1*P1 + k2*P2 conjunto contra duas multiplicações e uma soma"""
+        import random
+        from cryptography.bitcoin_crypto import (
+            G, Secp256k1, POINT_AT_INFINITY,
+            point_add, point_multiply, point_multiply_shamir
+        )
+        
+        rng = random.Random(1234)
+        Q = point_multiply(rng.randrange(1, Secp256k1.n), G)
+        scalars = [(rng.randrange(1, Secp256k1.n), rng.randrange(1, Secp256k1.n)) for _ in range(5)]
+        # Escalares extremos: zero, um e n - 1
+        scalars += [(0, 5), (7, 0), (1, 1), (Secp256k1.n - 1, 1), (Secp256k1.n - 1, Secp256k1.n - 1)]
+        
+        for k1, k2 in scalars:
+            expected = point_add(point_multiply(k1, G), point_multiply(k2, Q))
+            assert point_multiply_shamir(k1, G, k2, Q) == expected
+        
+        # u₁*G + u₂*Q no infinito
+        k = rng.randrange(1, Secp256k1.n)
+        assert point_multiply_shamir(k, G, Secp256k1.n - k, G) == POINT_AT_INFINITY
+    
     def test_ecdsa_signature(self):
         """Testa assinatura e verificação ECDSA"""
         # Gera chaves
@@ -183,6 +205,56 @@ class TestBitcoinCryptography:
         tampered_message = b"Transfer 2 BTC to Alice"
         assert not verify_signature(tampered_message, signature, public_key)
     
+    def test_block_mining_parallel_matches_serial(self):
+        """Testa que mineração em vários processos acha o mesmo nonce que a serial"""
+        from blockchain.bitcoin_blockchain import Block, Transaction, TransactionOutput
+        
+        coinbase = Transaction(
+            inputs=[],
+            outputs=[TransactionOutput(amount=50.0, recipient_address="1miner")],
+        )
+        
+        def mined(workers):
+            block = Block(
+                index=1, timestamp=1_700_000_000.0, transactions=[coinbase],
+                previous_hash="0" * 64, difficulty=10,
+            )
+            block.mine(workers=workers)
+            return block
+        
+        serial = mined(1)
+        parallel = mined(2)
+        assert (parallel.nonce, parallel.block_hash) == (serial.nonce, serial.block_hash)
+        assert parallel.verify()
+    
+    def test_coincurve_cross_verification(self, monkeypatch):
+        """Testa que libsecp256k1 (coincurve) e o caminho em Python puro concordam"""
+        from cryptography import bitcoin_crypto
+        from cryptography.bitcoin_crypto import POINT_AT_INFINITY, Signature, Secp256k1
+        
+        if not bitcoin_crypto.COINCURVE_AVAILABLE:
+            pytest.skip("coincurve indisponível (ou BITCOIN_PURE_PYTHON=1)")
+        
+        def with_backend(native, func, *args):
+            monkeypatch.setattr(bitcoin_crypto, "COINCURVE_AVAILABLE", native)
+            return func(*args)
+        
+        message = b"Transfer 1 BTC to Alice"
+        for _ in range(5):
+            private_key = generate_private_key()
+            public_key = with_backend(True, private_key_to_public_key, private_key)
+            assert public_key == with_backend(False, private_key_to_public_key, private_key)
+            
+            for signer in (True, False):
+                signature = with_backend(signer, sign_message, message, private_key)
+                # s alto é a mesma assinatura e vale nos dois caminhos
+                high_s = Signature(signature.r, Secp256k1.n - signature.s)
+                for verifier in (True, False):
+                    assert with_backend(verifier, verify_signature, message, signature, public_key)
+                    assert with_backend(verifier, verify_signature, message, high_s, public_key)
+                    assert not with_backend(verifier, verify_signature, b"tampered", signature, public_key)
+                    assert not with_backend(verifier, verify_signature, message, signature, POINT_AT_INFINITY)
+    
     def test_merkle_tree(self):
         """Testa Merkle Tree"""
         from cryptography.bitcoin_crypto import double_sha256
@@ -210,6 +282,32 @@ class TestBitcoinCryptography:
         # Prova inválida para transação errada
         assert not MerkleTree.verify_proof(transactions[0], proof, root)
     
+    def test_merkle_tree_odd_leaf_counts(self):
+        """Testa raiz e provas com número ímpar de folhas (último nó pareado consigo)"""
+        from cryptography.bitcoin_crypto import double_sha256, merkle_root
+        
+        def reference_root(level):
+            while len(level) > 1:
+                if len(level) % 2:
+                    level = level + [level[-1]]
+                level = [double_sha256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+            return level[0]
+        
+        for count in range(1, 10):
+            transactions = [double_sha256(f"tx{i}".encode()) for i in range(count)]
+            tree = MerkleTree(transactions)
+            root = tree.get_root()
+            
+            assert root == reference_root(transactions)
+            assert merkle_root(transactions) == root
+            
+            for i, tx in enumerate(transactions):
+                proof = tree.get_proof(i)
+                assert MerkleTree.verify_proof(tx, proof, root)
+                if count > 1:
+                    other = transactions[(i + 1) % count]
+                    assert not MerkleTree.verify_proof(other, proof, root)
+    
     def test_proof_of_work(self):
         """Testa Proof of Work"""
         from cryptography.bitcoin_crypto import verify_proof_of_work
@@ -225,6 +323,19 @@ class TestBitcoinCryptography:
         
         # Nonce errado falha
         assert not verify_proof_of_work(data, nonce + 1, difficulty)
+    
+    def test_proof_of_work_parallel_matches_serial(self):
+        """Testa que a busca em vários processos devolve o nonce da busca serial"""
+        from cryptography.bitcoin_crypto import verify_proof_of_work
+        
+        data = b"Block data"
+        difficulty = 12
+        
+        serial = proof_of_work(data, difficulty)
+        parallel = proof_of_work(data, difficulty, workers=2)
+        
+        assert parallel == serial
+        assert verify_proof_of_work(data, parallel[0], difficulty)
 
 
 # ============================================================================
@@ -313,6 +424,200 @@ class TestEdgeCases:
         message = b"x" * 10000
         signature = sign_message(message, private_key)
         assert verify_signature(message, signature, public_key)
+    
+    def test_transaction_hash_bound_to_content(self):
+        """Testa que assinaturas não valem para outro conteúdo com o mesmo tx_hash"""
+        from blockchain.bitcoin_blockchain import Transaction, TransactionOutput
+        
+        chain, wallet = _funded_wallet()
+        tx = wallet.send("1BoatSLRHtKNngkdXEeobR76b53LETtpyT", 1.0)
+        assert tx is not None
+        
+        # tx_hash é derivado, não argumento do construtor
+        with pytest.raises(TypeError):
+            Transaction(inputs=tx.inputs, outputs=tx.outputs, tx_hash=tx.tx_hash)
+        
+        # Mesmos inputs assinados e tx_hash, outputs pagando outro endereço
+        forged = Transaction(
+            inputs=tx.inputs,
+            outputs=[TransactionOutput(amount=49.0, recipient_address="1thief")],
+            timestamp=tx.timestamp,
+        )
+        forged.tx_hash = tx.tx_hash
+        assert not forged.verify(chain.utxo_set)
+        assert not chain.add_transaction(forged)
+        
+        # Alterar outputs depois de assinar também invalida
+        tx.outputs[0].recipient_address = "1thief"
+        assert not tx.verify(chain.utxo_set)
+    
+    def test_transaction_duplicate_input(self):
+        """Testa que o mesmo UTXO não pode ser gasto duas vezes na mesma transação"""
+        from blockchain.bitcoin_blockchain import (
+            Transaction, TransactionInput, TransactionOutput
+        )
+        
+        chain, wallet = _funded_wallet()
+        (tx_hash, index, utxo), = chain.get_utxos_for_address(wallet.address)
+        
+        tx = Transaction(
+            inputs=[TransactionInput(tx_hash, index), TransactionInput(tx_hash, index)],
+            outputs=[TransactionOutput(amount=2 * utxo.amount, recipient_address="1thief")],
+        )
+        tx.sign(wallet.private_key, chain.utxo_set)
+        
+        assert not tx.verify(chain.utxo_set)
+        assert not chain.add_transaction(tx)
+        
+        # Um único input do mesmo UTXO é aceito
+        tx = Transaction(
+            inputs=[TransactionInput(tx_hash, index)],
+            outputs=[TransactionOutput(amount=utxo.amount, recipient_address="1thief")],
+        )
+        tx.sign(wallet.private_key, chain.utxo_set)
+        assert chain.add_transaction(tx)
+    
+    def test_ttl_cache_expiry_and_eviction(self, monkeypatch):
+        """Testa expiração por TTL e descarte LRU do ttl_cache"""
+        import asyncio
+        from utils import ttl_cache as ttl_cache_module
+        
+        now = [1000.0]
+        monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now[0])
+        
+        calls = []
+        
+        @ttl_cache_module.ttl_cache(maxsize=2, ttl=10)
+        def square(x):
+            calls.append(x)
+            return x * x
+        
+        assert square(2) == 4 and square(2) == 4
+        assert calls == [2]
+        
+        # Expira após ttl segundos
+        now[0] += 10
+        assert square(2) == 4
+        assert calls == [2, 2]
+        
+        # LRU: acessar 2 torna 3 o mais antigo, descartado ao inserir 4
+        square(3)
+        square(2)
+        square(4)
+        assert calls == [2, 2, 3, 4]
+        square(2)
+        square(3)
+        assert calls == [2, 2, 3, 4, 3]
+        
+        square.cache_clear()
+        square(4)
+        assert calls == [2, 2, 3, 4, 3, 4]
+        
+        # Em funções async o resultado aguardado é que fica em cache
+        async_calls = []
+        
+        @ttl_cache_module.ttl_cache(maxsize=2, ttl=10)
+        async def double(x):
+            async_calls.append(x)
+            return 2 * x
+        
+        assert asyncio.run(double(5)) == 10
+        assert asyncio.run(double(5)) == 10
+        assert async_calls == [5]
+        now[0] += 10
+        assert asyncio.run(double(5)) == 10
+        assert async_calls == [5, 5]
+    
+    def test_web_learner_cancelled_waiter(self, monkeypatch, tmp_path):
+        """Testa que cancelar quem aguarda uma pesquisa em andamento não afeta os demais"""
+        import asyncio
+        from agents.web_learner import WebLearningAgent, LearningEntry
+        
+        monkeypatch.setattr(WebLearningAgent, "_instance", None)
+        agent = WebLearningAgent(knowledge_base_path=str(tmp_path / "kb.jsonl"))
+        
+        async def slow_learn(topic):
+            await asyncio.sleep(0.05)
+            return LearningEntry(topic=topic, query="q", knowledge="k", sources=[], confidence=0.9)
+        
+        monkeypatch.setattr(agent, "_learn_fresh", slow_learn)
+        
+        async def scenario():
+            owner = asyncio.create_task(agent.learn_about("t"))
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(agent.learn_about("t")) for _ in range(2)]
+            await asyncio.sleep(0)
+            waiters[0].cancel()
+            results = await asyncio.gather(owner, *waiters, return_exceptions=True)
+            await agent.client.aclose()
+            return results
+        
+        entry, cancelled, joined = asyncio.run(scenario())
+        assert isinstance(entry, LearningEntry)
+        assert isinstance(cancelled, asyncio.CancelledError)
+        assert joined is entry
+        assert "t" not in agent._inflight
+    
+    def test_web_learner_migrates_legacy_knowledge_base(self, monkeypatch, tmp_path):
+        """Testa que a base legada knowledge_base.json é migrada para o journal"""
+        import asyncio
+        import json
+        from agents.web_learner import WebLearningAgent
+        
+        legacy = {
+            "risk management": {
+                "topic": "risk management", "query": "q", "knowledge": "k",
+                "sources": ["https://example.com"], "confidence": 0.8,
+                "learned_at": "2025-01-01T00:00:00", "use_count": 3,
+            }
+        }
+        (tmp_path / "knowledge_base.json").write_text(json.dumps(legacy), encoding="utf-8")
+        journal = tmp_path / "knowledge_base.jsonl"
+        
+        def load():
+            monkeypatch.setattr(WebLearningAgent, "_instance", None)
+            agent = WebLearningAgent(knowledge_base_path=str(journal))
+            asyncio.run(agent.client.aclose())
+            return agent
+        
+        agent = load()
+        assert agent.knowledge["risk management"].use_count == 3
+        assert len(journal.read_bytes().splitlines()) == 1
+        
+        # Próximas cargas leem só o journal
+        (tmp_path / "knowledge_base.json").unlink()
+        agent = load()
+        assert agent.knowledge["risk management"].sources == ["https://example.com"]
+    
+    def test_market_chart_cache_shared_read_only(self):
+        """Testa que o gráfico em cache ignora a caixa do ticker e não pode ser alterado"""
+        import asyncio
+        from agents.quant import QuantitativeAgent
+        
+        agent = QuantitativeAgent()
+        agent._market_chart.cache_clear()
+        
+        async def charts():
+            return await agent.get_market_chart("btc"), await agent.get_market_chart("BTC")
+        
+        lower, upper = asyncio.run(charts())
+        assert lower is upper
+        assert upper["ticker"] == "BTC"
+        
+        with pytest.raises(ValueError):
+            upper["prices"][0] = 0.0
+        with pytest.raises(ValueError):
+            upper["volumes"][0] = 0.0
+
+
+def _funded_wallet():
+    """Cadeia de baixa dificuldade com uma carteira dona de uma recompensa de bloco"""
+    from blockchain.bitcoin_blockchain import Blockchain, Wallet
+    
+    chain = Blockchain(difficulty=4)
+    wallet = Wallet(chain)
+    chain.mine_block(wallet.address)
+    return chain, wallet
 
 
 # ============================================================================